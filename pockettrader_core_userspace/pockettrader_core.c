@@ -157,12 +157,96 @@ typedef struct {
     CoreConfig *config;
 } FeedThreadArgs;
 
+typedef struct {
+    double   bid;
+    double   ask;
+    uint64_t seq;
+} TickFields;
+
+// Parse one TICK line.
+// Expected: TICK EXA BTCUSD <bid> <ask> <seq> <ts_ns>
+// Returns 1 if the line was a valid TICK (and fills *out), 0 otherwise.
+static int parse_tick_line(const char *line, int is_exa, TickFields *out) {
+    char exch[8]    = {0};
+    char symbol[16] = {0};
+    double bid      = 0.0;
+    double ask      = 0.0;
+    unsigned long long seq_ull   = 0;
+    unsigned long long ts_ns_ull = 0;
+
+    int scanned = sscanf(line,
+                         "TICK %7s %15s %lf %lf %llu %llu",
+                         exch,
+                         symbol,
+                         &bid,
+                         &ask,
+                         &seq_ull,
+                         &ts_ns_ull);
+    if (scanned < 6) {
+        fprintf(stderr, "Bad TICK message: %s\n", line);
+        return 0;
+    }
+
+#if DEBUG_TICKS
+    fprintf(stdout,
+            "[%s] TICK %s bid=%.2f ask=%.2f seq=%llu\n",
+            is_exa ? "EXA" : "EXB",
+            symbol,
+            bid,
+            ask,
+            (unsigned long long)seq_ull);
+    fflush(stdout);
+#else
+    (void)is_exa;
+#endif
+
+    out->bid = bid;
+    out->ask = ask;
+    out->seq = (uint64_t)seq_ull;
+    return 1;
+}
+
+// Publish the newest tick of a datagram into shared state. t_recv is taken
+// once per datagram, so ticks coalesced into one datagram count as a single
+// arrival in the interval / latency stats.
+static void publish_tick(const TickFields *tick, int is_exa, uint64_t t_recv) {
+    if (pthread_mutex_lock(&g_shared->mutex) == 0) {
+        PocketTraderState *st = &g_shared->state;
+        ExchangeQuote *q = is_exa ? &st->exa : &st->exb;
+
+        uint64_t interval_ns = 0;
+        if (q->last_update_ns != 0 && t_recv > q->last_update_ns) {
+            interval_ns = t_recv - q->last_update_ns;
+        }
+
+        q->bid            = tick->bid;
+        q->ask            = tick->ask;
+        q->seq            = tick->seq;
+        q->last_update_ns = t_recv;
+        q->connected      = 1;
+
+        if (interval_ns > 0) {
+            if (is_exa) {
+                st->last_tick_latency_exa_ns = interval_ns;
+                st->avg_tick_latency_exa_ns  =
+                    ema_ns(st->avg_tick_latency_exa_ns, interval_ns);
+            } else {
+                st->last_tick_latency_exb_ns = interval_ns;
+                st->avg_tick_latency_exb_ns  =
+                    ema_ns(st->avg_tick_latency_exb_ns, interval_ns);
+            }
+        }
+
+        pthread_mutex_unlock(&g_shared->mutex);
+    }
+}
+
 static void *feed_receiver_thread(void *arg) {
     FeedThreadArgs *fta = (FeedThreadArgs *)arg;
     int sock   = fta->sock;
     int is_exa = fta->is_exa;
 
-    char buf[256];
+    char buf[2048];
     struct sockaddr_in src_addr;
     socklen_t addrlen = sizeof(src_addr);
 
@@ -185,70 +269,22 @@ static void *feed_receiver_thread(void *arg) {
         }
 
         buf[n] = '\0';
-
-        // Expected: TICK EXA BTCUSD <bid> <ask> <seq> <ts_ns>
-        char exch[8]    = {0};
-        char symbol[16] = {0};
-        double bid      = 0.0;
-        double ask      = 0.0;
-        unsigned long long seq_ull   = 0;
-        unsigned long long ts_ns_ull = 0;
-
-        int scanned = sscanf(buf,
-                             "TICK %7s %15s %lf %lf %llu %llu",
-                             exch,
-                             symbol,
-                             &bid,
-                             &ask,
-                             &seq_ull,
-                             &ts_ns_ull);
-        if (scanned < 6) {
-            fprintf(stderr, "Bad TICK message: %s\n", buf);
-            continue;
-        }
-
-#if DEBUG_TICKS
-        fprintf(stdout,
-                "[%s] TICK %s bid=%.2f ask=%.2f seq=%llu\n",
-                is_exa ? "EXA" : "EXB",
-                symbol,
-                bid,
-                ask,
-                (unsigned long long)seq_ull);
-        fflush(stdout);
-#endif
-
         uint64_t t_recv = now_ns();  // BBB receive time (monotonic)
 
-        if (pthread_mutex_lock(&g_shared->mutex) == 0) {
-            PocketTraderState *st = &g_shared->state;
-            ExchangeQuote *q = is_exa ? &st->exa : &st->exb;
-
-            uint64_t interval_ns = 0;
-            if (q->last_update_ns != 0 && t_recv > q->last_update_ns) {
-                interval_ns = t_recv - q->last_update_ns;
-            }
-
-            q->bid            = bid;
-            q->ask            = ask;
-            q->seq            = (uint64_t)seq_ull;
-            q->last_update_ns = t_recv;
-            q->connected      = 1;
-
-            if (interval_ns > 0) {
-                if (is_exa) {
-                    st->last_tick_latency_exa_ns = interval_ns;
-                    st->avg_tick_latency_exa_ns  =
-                        ema_ns(st->avg_tick_latency_exa_ns, interval_ns);
-                } else {
-                    st->last_tick_latency_exb_ns = interval_ns;
-                    st->avg_tick_latency_exb_ns  =
-                        ema_ns(st->avg_tick_latency_exb_ns, interval_ns);
-                }
-            }
-
-            pthread_mutex_unlock(&g_shared->mutex);
+        // A datagram may carry several '\n'-separated TICK lines, oldest
+        // first; only the newest is published
+        TickFields tick = {0};
+        char *saveptr = NULL;
+        int n_ok = 0;
+        for (char *line = strtok_r(buf, "\n", &saveptr);
+             line != NULL;
+             line = strtok_r(NULL, "\n", &saveptr)) {
+            n_ok += parse_tick_line(line, is_exa, &tick);
+        }
+        if (n_ok == 0) {
+            continue;
         }
+        publish_tick(&tick, is_exa, t_recv);
 
         // Initialize trade target IP from first packet
         if (!g_trade_addr_ready) {
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+console_log.py
+
+Console logging shared by exchange_sim.py and trade_bridge.py.
+
+Loggers get a logging.handlers.QueueHandler, and a QueueListener thread
+writes the records to stdout, so the message path only enqueues a record
+and never blocks on the terminal. Per-message lines (every trade, every
+leg) are logged at DEBUG and gated with log.isEnabledFor(logging.DEBUG),
+so they cost one cached level check when the CLI flag is off.
+"""
+
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Tuple
+
+
+def start_console_log(name: str,
+                      level: int = logging.INFO) -> Tuple[logging.Logger, QueueListener]:
+    """
+    Returns (logger, listener) with the listener thread already running.
+    Call listener.stop() on shutdown; it writes out everything queued.
+    """
+    q: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = QueueListener(q, handler)
+    listener.start()
+
+    log = logging.getLogger(name)
+    log.handlers.clear()
+    log.addHandler(QueueHandler(q))
+    log.setLevel(level)
+    log.propagate = False
+    return log, listener
@@ -5,14 +5,21 @@ exchange_sim.py
 Exchange simulator with real order book:
 
 - Maintains limit order book (OrderBook)
-- Accepts client orders over UDP:
+- Accepts client orders over UDP, either as fixed-layout binary frames
+  (see order_wire.py) or as the ASCII debugging format:
     NEW <client_id> <order_id> <side> <type> <price> <qty>
     CXL <client_id> <order_id>
 - Generates random background order flow
 - Publishes top-of-book ticks over UDP (for PocketTrader)
 - Publishes fills over UDP to a "bridge" process:
 
-FILL message format (UDP, text):
+TICK message format (UDP, text):
+    TICK <EXCH_ID> <SYMBOL> <bid> <ask> <seq> <ts_ns>
+  Ticks that become due in the same pass are coalesced into one datagram as
+  '\n'-separated lines; receivers must split on '\n'.
+
+FILL message format (UDP): a binary FILL frame (order_wire.py), or with
+--ascii-fills the text form:
     FILL <EXCH_ID> <SYMBOL> <price> <qty> <taker_client> <taker_oid>
          <maker_client> <maker_oid> <ts_ns>
 
@@ -25,13 +32,156 @@ IMPORTANT:
 """
 
 import argparse
+import bisect
+import heapq
+import itertools
+import logging
+import os
 import random
+import selectors
+import signal
 import socket
-import select
+import sys
 import time
-from typing import Tuple, List
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+try:  # Cython build of the book (setup.py build_ext --inplace)
+    from orderbook_c import OrderBook, Order, OrderPool, Trade
+except ImportError:
+    from orderbook import OrderBook, Order, OrderPool, Trade
+from console_log import start_console_log
+from order_wire import (CXL_FMT, FILL_FMT, NEW_FMT, OP_CXL, OP_FILL, OP_NEW,
+                        SIDE_B, SIDE_FROM_BYTE, SIDE_FROM_TOKEN, SIDE_S,
+                        TYPE_FROM_BYTE, TYPE_FROM_TOKEN, TYPE_L, TYPE_M,
+                        decode_client_id)
+from udp_batch import UdpRecvBatch, UdpSendBatch
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to the pure-Python draws
+    njit = None
+
+SOCK_BUF_BYTES = 8 * 1024 * 1024
+ORDER_BUSY_POLL_US = 50
+SO_BUSY_POLL = getattr(socket, "SO_BUSY_POLL", 46)  # Linux only
+
+MAX_TICK_DATAGRAM = 1400  # bytes; keeps coalesced TICK datagrams under the MTU
+SPREAD_HALF = 1.5  # max distance of background limit orders from mid
+WALK_CHUNK = 8192  # mid-price random-walk steps precomputed per refill
+TRADE_RING = 4096  # Trade objects the book recycles; fills are sent right away
+
+
+def _draw_flow_py(mid: float, order_prob: float, cancel_prob: float,
+                  min_qty: float, max_qty: float,
+                  _rand=random.random,
+                  _randrange=random.randrange, _uniform=random.uniform):
+    """
+    One step of background flow randomness around an already-walked mid.
+    Returns (emit_limit, side_idx, price, qty, emit_mkt, mkt_side_idx, mkt_qty).
+
+    The RNG functions are bound as default args so each call resolves them
+    as fast locals rather than module attribute lookups.
+    """
+    emit_limit = _rand() < order_prob
+    side_idx = 0
+    price = 0.0
+    qty = 0.0
+    if emit_limit:
+        side_idx = _randrange(2)
+        if side_idx == 0:
+            price = mid - _rand() * SPREAD_HALF
+        else:
+            price = mid + _rand() * SPREAD_HALF
+        qty = _uniform(min_qty, max_qty)
+
+    emit_mkt = _rand() < cancel_prob
+    mkt_side_idx = 0
+    mkt_qty = 0.0
+    if emit_mkt:
+        mkt_side_idx = _randrange(2)
+        mkt_qty = _uniform(min_qty, max_qty)
+
+    return emit_limit, side_idx, price, qty, emit_mkt, mkt_side_idx, mkt_qty
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _draw_flow_jit(mid, order_prob, cancel_prob, min_qty, max_qty):
+        # Same draws as _draw_flow_py, using Numba's np.random backend
+        emit_limit = np.random.random() < order_prob
+        side_idx = 0
+        price = 0.0
+        qty = 0.0
+        if emit_limit:
+            side_idx = np.random.randint(0, 2)
+            if side_idx == 0:
+                price = mid - np.random.random() * SPREAD_HALF
+            else:
+                price = mid + np.random.random() * SPREAD_HALF
+            qty = np.random.uniform(min_qty, max_qty)
+
+        emit_mkt = np.random.random() < cancel_prob
+        mkt_side_idx = 0
+        mkt_qty = 0.0
+        if emit_mkt:
+            mkt_side_idx = np.random.randint(0, 2)
+            mkt_qty = np.random.uniform(min_qty, max_qty)
+
+        return emit_limit, side_idx, price, qty, emit_mkt, mkt_side_idx, mkt_qty
+
+    draw_flow = _draw_flow_jit
+else:
+    draw_flow = _draw_flow_py
 
-from orderbook import OrderBook, Order, Trade
+
+class MidPriceWalk:
+    """
+    Gaussian random walk for the background mid price, precomputed in
+    chunks as a cumulative sum of increments.
+
+    With NumPy a chunk is one Generator.normal() + cumsum(); without it the
+    chunk is built with random.gauss() and itertools.accumulate(). A
+    non-positive mid is reflected to abs(mid) + 1, as before, by shifting
+    the base the rest of the chunk is added to.
+    """
+
+    def __init__(self, base_price: float, volatility: float, size: int = WALK_CHUNK):
+        self.volatility = volatility
+        self.size = size
+        self._rng = np.random.default_rng() if np is not None else None
+        self._walk: List[float] = []
+        self._base = base_price
+        self._idx = 0
+        self.mid = base_price
+        self._refill()
+
+    def _refill(self) -> None:
+        if self._rng is not None:
+            self._walk = self._rng.normal(0.0, self.volatility, self.size).cumsum().tolist()
+        else:
+            gauss = random.gauss
+            vol = self.volatility
+            self._walk = list(itertools.accumulate(gauss(0.0, vol) for _ in range(self.size)))
+        self._base = self.mid
+        self._idx = 0
+
+    def next(self) -> float:
+        if self._idx >= self.size:
+            self._refill()
+        offset = self._walk[self._idx]
+        self._idx += 1
+        mid = self._base + offset
+        if mid <= 0.0:
+            mid = abs(mid) + 1.0
+            self._base = mid - offset
+        self.mid = mid
+        return mid
 
 
 class RandomOrderFlow:
@@ -43,87 +193,204 @@ class RandomOrderFlow:
                  order_prob: float = 0.4,
                  cancel_prob: float = 0.2,
                  min_qty: float = 0.01,
-                 max_qty: float = 0.1):
+                 max_qty: float = 0.1,
+                 order_pool: Optional[OrderPool] = None):
         self.book = book
+        self.order_pool = order_pool if order_pool is not None else OrderPool(0)
         self.exch_id = exch_id
+        self.client_id = f"BG_{exch_id}"
         self.mid_price = base_price
         self.volatility = volatility
+        self._walk = MidPriceWalk(base_price, volatility)
         self.order_prob = order_prob
         self.cancel_prob = cancel_prob
         self.min_qty = min_qty
         self.max_qty = max_qty
         self._next_order_id = 1_000_000_000
 
+        # Trigger JIT compilation (or load the on-disk cache) up front
+        draw_flow(base_price, order_prob, cancel_prob, min_qty, max_qty)
+
     def step(self, now_ns: int) -> None:
         # 'now_ns' here is host MONOTONIC time used only for simulation timing / ordering
-        self.mid_price += random.gauss(0.0, self.volatility)
-        if self.mid_price <= 0:
-            self.mid_price = abs(self.mid_price) + 1.0
+        self.mid_price = mid = self._walk.next()
+        (emit_limit, side_idx, price, qty,
+         emit_mkt, mkt_side_idx, mkt_qty) = draw_flow(
+            mid, self.order_prob, self.cancel_prob, self.min_qty, self.max_qty)
 
         # Random new background limit orders
-        if random.random() < self.order_prob:
-            side = random.choice(["B", "S"])
-            spread_half = 1.5
-            if side == "B":
-                price = self.mid_price - random.random() * spread_half
-            else:
-                price = self.mid_price + random.random() * spread_half
-
-            qty = random.uniform(self.min_qty, self.max_qty)
+        if emit_limit:
             oid = self._next_order_id
             self._next_order_id += 1
 
-            order = Order(
+            order = self.order_pool.get(
                 order_id=oid,
-                client_id=f"BG_{self.exch_id}",
-                side=side,
-                type="L",
+                client_id=self.client_id,
+                side=side_idx,  # draw_flow's 0/1 are SIDE_B/SIDE_S
+                type=TYPE_L,
                 price=price,
                 qty=qty,
-                remaining=qty,
                 ts_ns=now_ns,  # simulation / matching timestamp (monotonic)
             )
             _ = self.book.add_order(order)
 
         # Random aggressive orders to cross the spread
-        if random.random() < self.cancel_prob:
-            best_bid = self.book.best_bid()
-            best_ask = self.book.best_ask()
-            target_side = random.choice(["B", "S"])
-            if target_side == "B" and best_bid:
-                price, _ = best_bid
-                qty = random.uniform(self.min_qty, self.max_qty)
-                oid = self._next_order_id
-                self._next_order_id += 1
-                mkt = Order(
-                    order_id=oid,
-                    client_id=f"BG_{self.exch_id}",
-                    side="S",
-                    type="M",
-                    price=price,
-                    qty=qty,
-                    remaining=qty,
-                    ts_ns=now_ns,
-                )
-                self.book.add_order(mkt)
-            elif target_side == "S" and best_ask:
-                price, _ = best_ask
-                qty = random.uniform(self.min_qty, self.max_qty)
+        if emit_mkt:
+            # Hit the bids with a sell, or lift the asks with a buy
+            if mkt_side_idx == SIDE_B:
+                best = self.book.best_bid()
+                mkt_side = SIDE_S
+            else:
+                best = self.book.best_ask()
+                mkt_side = SIDE_B
+            if best:
+                price, _ = best
                 oid = self._next_order_id
                 self._next_order_id += 1
-                mkt = Order(
+                mkt = self.order_pool.get(
                     order_id=oid,
-                    client_id=f"BG_{self.exch_id}",
-                    side="B",
-                    type="M",
+                    client_id=self.client_id,
+                    side=mkt_side,
+                    type=TYPE_M,
                     price=price,
-                    qty=qty,
-                    remaining=qty,
+                    qty=mkt_qty,
                     ts_ns=now_ns,
                 )
                 self.book.add_order(mkt)
 
 
+class _Terminated(Exception):
+    """Raised from the SIGTERM handler to unwind ExchangeSimulator.run()."""
+
+
+def _raise_terminated(signum, frame) -> None:
+    raise _Terminated()
+
+
+def _msg_text(data: bytes) -> str:
+    # Printable form of a raw text frame, for log lines only
+    return data.decode("ascii", errors="ignore").strip()
+
+
+def tune_udp_socket(sock: socket.socket, busy_poll_us: int = 0) -> None:
+    """
+    Enlarge kernel send/receive buffers so TICK/FILL/order bursts are not
+    dropped, and optionally enable SO_BUSY_POLL (Linux). The kernel caps the
+    buffers at net.core.{w,r}mem_max; busy-poll above net.core.busy_read
+    needs CAP_NET_ADMIN, so failures there are ignored.
+    """
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCK_BUF_BYTES)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCK_BUF_BYTES)
+    if busy_poll_us > 0 and sys.platform.startswith("linux"):
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, SO_BUSY_POLL, busy_poll_us)
+        except OSError:
+            pass
+
+
+class PendingTickQueue:
+    """
+    Delayed TICKs stored as parallel arrays (SoA) sorted by scheduled_ns,
+    with head/tail indices.
+
+    Jitter is small next to the tick interval, so push() almost always
+    lands at the tail. pop_due() finds the cutoff with one binary search
+    and returns the contiguous [start, end) index range to send.
+    """
+
+    def __init__(self, capacity: int = 4096):
+        self.capacity = capacity
+        self.sched = array("q", bytes(8 * capacity))
+        self.seq = array("q", bytes(8 * capacity))
+        self.bid = array("d", bytes(8 * capacity))
+        self.ask = array("d", bytes(8 * capacity))
+        self._head = 0
+        self._tail = 0
+
+    def __len__(self) -> int:
+        return self._tail - self._head
+
+    def next_deadline(self) -> Optional[int]:
+        if self._head == self._tail:
+            return None
+        return self.sched[self._head]
+
+    def push(self, scheduled_ns: int, seq: int, bid: float, ask: float) -> None:
+        if self._tail == self.capacity:
+            self._make_room()
+        head, tail = self._head, self._tail
+        # bisect_right keeps FIFO order among equal deadlines
+        pos = bisect.bisect_right(self.sched, scheduled_ns, head, tail)
+        if pos < tail:
+            for col in (self.sched, self.seq, self.bid, self.ask):
+                col[pos + 1:tail + 1] = col[pos:tail]
+        self.sched[pos] = scheduled_ns
+        self.seq[pos] = seq
+        self.bid[pos] = bid
+        self.ask[pos] = ask
+        self._tail = tail + 1
+
+    def pop_due(self, now_ns: int) -> Tuple[int, int]:
+        """
+        Dequeue every TICK with scheduled_ns <= now_ns. The returned index
+        range stays valid until the next push().
+        """
+        start = self._head
+        end = bisect.bisect_right(self.sched, now_ns, start, self._tail)
+        if end == self._tail:
+            self._head = self._tail = 0
+        else:
+            self._head = end
+        return start, end
+
+    def _make_room(self) -> None:
+        head, tail = self._head, self._tail
+        if head > 0:
+            # Compact live entries to the front
+            for col in (self.sched, self.seq, self.bid, self.ask):
+                col[0:tail - head] = col[head:tail]
+            self._head, self._tail = 0, tail - head
+        else:
+            for col in (self.sched, self.seq, self.bid, self.ask):
+                col.extend(array(col.typecode, bytes(8 * self.capacity)))
+            self.capacity *= 2
+
+
+class LatencySampler:
+    """
+    Gaussian latency samples (ns), clamped at zero, drawn in bulk.
+
+    With NumPy a whole buffer comes from one Generator.normal() call;
+    without it the buffer is filled with random.gauss().
+    """
+
+    def __init__(self, mean_ns: float, std_ns: float, size: int = 4096):
+        self.mean_ns = mean_ns
+        self.std_ns = std_ns
+        self.size = size
+        self._rng = np.random.default_rng() if np is not None else None
+        self._buf: List[float] = []
+        self._idx = 0
+        self._refill()
+
+    def _refill(self) -> None:
+        if self._rng is not None:
+            draws = self._rng.normal(self.mean_ns, self.std_ns, self.size)
+            self._buf = np.maximum(draws, 0.0).tolist()
+        else:
+            gauss = random.gauss
+            self._buf = [max(0.0, gauss(self.mean_ns, self.std_ns))
+                         for _ in range(self.size)]
+        self._idx = 0
+
+    def next(self) -> float:
+        if self._idx >= self.size:
+            self._refill()
+        v = self._buf[self._idx]
+        self._idx += 1
+        return v
+
+
 class ExchangeSimulator:
     def __init__(self,
                  exch_id: str,
@@ -141,17 +408,25 @@ class ExchangeSimulator:
                  order_latency_mean_us: float = 0.0,
                  order_latency_std_us: float = 0.0,
                  feed_latency_mean_us: float = 0.0,
-                 feed_latency_std_us: float = 0.0):
+                 feed_latency_std_us: float = 0.0,
+                 busy_wait: bool = False,
+                 log_trades: bool = False,
+                 ascii_fills: bool = False):
         self.exch_id = exch_id
         self.symbol = symbol
         self.seq = 0
 
-        self.book = OrderBook(symbol=symbol, tick_size=tick_size)
+        # Orders are drawn from this pool and returned by the book when done;
+        # Trades are reused from a ring, as each is consumed immediately
+        self._order_pool = OrderPool()
+        self.book = OrderBook(symbol=symbol, tick_size=tick_size,
+                              order_pool=self._order_pool, trade_ring=TRADE_RING)
         self.rand_flow = RandomOrderFlow(
             book=self.book,
             exch_id=exch_id,
             base_price=base_price,
             volatility=volatility,
+            order_pool=self._order_pool,
         )
 
         # Latency model (all internal scheduling in MONOTONIC nanoseconds)
@@ -159,18 +434,55 @@ class ExchangeSimulator:
         self.order_latency_std_ns = max(0.0, order_latency_std_us) * 1000.0
         self.feed_latency_mean_ns = max(0.0, feed_latency_mean_us) * 1000.0
         self.feed_latency_std_ns = max(0.0, feed_latency_std_us) * 1000.0
+        self._order_jitter = LatencySampler(self.order_latency_mean_ns,
+                                            self.order_latency_std_ns)
+        self._feed_jitter = LatencySampler(self.feed_latency_mean_ns,
+                                           self.feed_latency_std_ns)
+
+        # Pick the order / tick scheduling paths once. With zero latency there
+        # is nothing to simulate, so orders go straight to the book and ticks
+        # straight to the feed batch, skipping the RNG and the heaps.
+        if self.order_latency_mean_ns == 0.0 and self.order_latency_std_ns == 0.0:
+            self._schedule_order = self._schedule_order_direct
+        else:
+            self._schedule_order = self._schedule_order_delayed
+        if self.feed_latency_mean_ns == 0.0 and self.feed_latency_std_ns == 0.0:
+            self._enqueue_tick = self._send_tick_now
+        else:
+            self._enqueue_tick = self._enqueue_tick_delayed
 
-        # Queues of (scheduled_mono_ns, payload)
-        self._pending_orders: List[Tuple[int, Order]] = []
-        self._pending_ticks: List[Tuple[int, float, float, int]] = []
+        # Gaussian jitter can schedule a later event earlier than a previous
+        # one, so both queues are ordered by scheduled_mono_ns, not arrival.
+        # Orders: min-heap of (scheduled_mono_ns, arrival_seq, order);
+        # arrival_seq breaks ties
+        self._pending_orders: List[Tuple[int, int, Order]] = []
+        self._order_arrival_seq = itertools.count()
+        # Ticks: sorted SoA arrays
+        self._pending_ticks = PendingTickQueue()
 
         # Market data feed socket
         self.feed_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self.feed_target = (feed_target_ip, feed_port)
+        # Fixed destination: connect() once so sends skip per-call addressing
+        self.feed_sock.connect(self.feed_target)
 
         # FILL feed socket
         self.fill_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self.fill_target = (fill_target_ip, fill_target_port)
+        self.fill_sock.connect(self.fill_target)
+
+        # Constant message prefixes, encoded once
+        self._tick_prefix = f"TICK {exch_id} {symbol} ".encode("ascii")
+        self._fill_prefix = f"FILL {exch_id} {symbol} ".encode("ascii")
+        self._exch_id_bytes = exch_id.encode("ascii")
+        self._symbol_bytes = symbol.encode("ascii")
+        self.ascii_fills = ascii_fills
+        # client_id -> ASCII bytes, for bytes %-formatting / FILL frames
+        self._client_id_bytes: Dict[str, bytes] = {}
+
+        # Outbound TICK/FILL datagrams are batched and flushed once per pass
+        self._feed_batch = UdpSendBatch(self.feed_sock)
+        self._fill_batch = UdpSendBatch(self.fill_sock)
 
         # Order entry socket (non-blocking)
         self.order_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
@@ -178,159 +490,334 @@ class ExchangeSimulator:
         self.order_sock.bind((order_listen_ip, order_port))
         self.order_sock.setblocking(False)
 
+        tune_udp_socket(self.feed_sock)
+        tune_udp_socket(self.fill_sock)
+        tune_udp_socket(self.order_sock, busy_poll_us=ORDER_BUSY_POLL_US)
+
+        # Persistent epoll registration (no fd_set rebuild per loop iteration)
+        selector_cls = getattr(selectors, "EpollSelector", selectors.DefaultSelector)
+        self._sel = selector_cls()
+        self._sel.register(self.order_sock, selectors.EVENT_READ)
+        self._order_recv = UdpRecvBatch(self.order_sock)
+        self.busy_wait = busy_wait
+        # Console output is enqueued and written by a listener thread, so the
+        # matching path never blocks on stdout; --log-trades enables the
+        # per-trade DEBUG lines
+        self.log, self._log_listener = start_console_log(
+            "exchange_sim", logging.DEBUG if log_trades else logging.INFO)
+
         # Use host MONOTONIC for internal pacing
         self.tick_interval_ns = int(1e9 / tick_hz)
         self.last_tick_ns = time.monotonic_ns()
         self.synthetic_mid = base_price
 
-        print(f"[{self.exch_id}] Exchange simulator up "
-              f"(symbol={self.symbol}, feed={self.feed_target}, "
-              f"orders={order_listen_ip}:{order_port}, "
-              f"fills={self.fill_target}, "
-              f"order_latency~{order_latency_mean_us}us, "
-              f"feed_latency~{feed_latency_mean_us}us)")
+        # Where available (Linux, Python 3.13+), the TICK cadence comes from a
+        # timerfd registered in the same epoll set as order_sock, so a single
+        # select() wakes for either. Otherwise run() paces ticks by clock check.
+        self._tick_timer_fd: Optional[int] = None
+        if hasattr(os, "timerfd_create") and not busy_wait:
+            self._tick_timer_fd = os.timerfd_create(
+                time.CLOCK_MONOTONIC, flags=os.TFD_NONBLOCK | os.TFD_CLOEXEC)
+            os.timerfd_settime_ns(self._tick_timer_fd,
+                                  initial=self.tick_interval_ns,
+                                  interval=self.tick_interval_ns)
+            self._sel.register(self._tick_timer_fd, selectors.EVENT_READ)
+
+        self.log.info(f"[{self.exch_id}] Exchange simulator up "
+                      f"(symbol={self.symbol}, feed={self.feed_target}, "
+                      f"orders={order_listen_ip}:{order_port}, "
+                      f"fills={self.fill_target}, "
+                      f"order_latency~{order_latency_mean_us}us, "
+                      f"feed_latency~{feed_latency_mean_us}us)")
 
     # ---------- core loop ----------
 
     def run(self) -> None:
-        poller_timeout = 0.005
-
+        # Busy-wait mode polls without blocking in the kernel
+        poller_timeout = 0.0 if self.busy_wait else 0.005
+        busy_wait = self.busy_wait
+        tick_interval_ns = self.tick_interval_ns
+
+        tick_timer = self._tick_timer_fd is not None
+
+        # Bind hot-loop callables once (avoids global/attribute lookups per pass)
+        mono = time.monotonic_ns
+        poll_events = self._poll_events
+        poll_timeout = self._poll_timeout
+        process_pending_orders = self._process_pending_orders
+        flow_step = self.rand_flow.step
+        publish_tick = self._publish_tick
+        flush_pending_ticks = self._flush_pending_ticks
+
+        # The scenario scripts stop the simulator with SIGTERM; unwind through
+        # the finally below so the console log queue is still written out
+        prev_sigterm = signal.signal(signal.SIGTERM, _raise_terminated)
         try:
             while True:
-                now_mono_ns = time.monotonic_ns()
+                now_mono_ns = mono()
 
-                # 1) Pull client messages and schedule orders
-                self._process_client_messages(timeout=poller_timeout)
+                # 1) Wait for client messages (or the tick timer / next pending
+                #    deadline) and schedule orders
+                tick_fired = poll_events(poll_timeout(now_mono_ns, poller_timeout))
 
                 # 2) Execute any orders whose simulated latency has expired
-                self._process_pending_orders(now_mono_ns)
+                process_pending_orders(now_mono_ns)
 
                 # 3) Advance background order flow (moves the book even if trader is idle)
-                self.rand_flow.step(now_mono_ns)
+                flow_step(now_mono_ns)
 
                 # 4) Take a book snapshot for the next TICK
-                if now_mono_ns - self.last_tick_ns >= self.tick_interval_ns:
-                    self._publish_tick(now_mono_ns)
+                if tick_timer:
+                    if tick_fired:
+                        publish_tick(now_mono_ns)
+                        self.last_tick_ns = now_mono_ns
+                elif now_mono_ns - self.last_tick_ns >= tick_interval_ns:
+                    publish_tick(now_mono_ns)
                     self.last_tick_ns = now_mono_ns
 
                 # 5) Deliver any TICKs whose simulated feed latency has expired
-                self._flush_pending_ticks(now_mono_ns)
+                flush_pending_ticks(now_mono_ns)
+
+                if busy_wait:
+                    # Short spin between polls instead of yielding the CPU
+                    for _ in range(64):
+                        pass
         except KeyboardInterrupt:
-            print(f"[{self.exch_id}] Stopped by user")
+            self.log.info(f"[{self.exch_id}] Stopped by user")
+        except _Terminated:
+            self.log.info(f"[{self.exch_id}] Stopped by SIGTERM")
+        finally:
+            signal.signal(signal.SIGTERM, prev_sigterm)
+            if self._tick_timer_fd is not None:
+                self._sel.unregister(self._tick_timer_fd)
+                os.close(self._tick_timer_fd)
+                self._tick_timer_fd = None
+            # Writes out whatever is still queued
+            self._log_listener.stop()
 
     # ---------- client message handling ----------
 
-    def _process_client_messages(self, timeout: float) -> None:
-        read_socks, _, _ = select.select([self.order_sock], [], [], timeout)
-        for s in read_socks:
-            try:
-                data, addr = s.recvfrom(4096)
-            except BlockingIOError:
-                return
-            if not data:
-                continue
-            msg = data.decode("ascii", errors="ignore").strip()
-            self._handle_client_message(msg, addr)
-
-    def _schedule_order(self, order: Order, now_mono_ns: int) -> None:
+    def _poll_timeout(self, now_mono_ns: int, max_timeout: float) -> float:
+        """
+        Block no longer than max_timeout, and wake early for the next pending
+        order/tick deadline (and the next TICK when paced by clock check).
+        """
+        deadline = None
+        if self._pending_orders:
+            deadline = self._pending_orders[0][0]
+        t = self._pending_ticks.next_deadline()
+        if t is not None and (deadline is None or t < deadline):
+            deadline = t
+        if self._tick_timer_fd is None:
+            t = self.last_tick_ns + self.tick_interval_ns
+            if deadline is None or t < deadline:
+                deadline = t
+        if deadline is None:
+            return max_timeout
+        wait = (deadline - now_mono_ns) / 1e9
+        if wait <= 0.0:
+            return 0.0
+        return wait if wait < max_timeout else max_timeout
+
+    def _poll_events(self, timeout: float) -> bool:
+        """
+        Wait on order_sock and the tick timer. Drains any client messages and
+        returns True if the tick timer expired.
+        """
+        tick_fired = False
+        for key, _ in self._sel.select(timeout):
+            if key.fileobj is self.order_sock:
+                self._process_client_messages()
+            else:
+                try:
+                    os.read(self._tick_timer_fd, 8)  # expiration count
+                except BlockingIOError:
+                    continue
+                tick_fired = True
+        return tick_fired
+
+    def _process_client_messages(self) -> None:
+        # Drain every queued datagram per wakeup, one recvmmsg() per batch
+        recv = self._order_recv.recv
+        handle = self._handle_client_message
+        handle_binary = self._handle_binary_message
+        max_batch = self._order_recv.max_batch
+        while True:
+            batch = recv()
+            # One clock read per batch; datagrams in a batch arrived together
+            now_mono_ns = time.monotonic_ns()
+            for data, addr in batch:
+                if not data:
+                    continue
+                if data[0] in (OP_NEW, OP_CXL):
+                    handle_binary(data, addr, now_mono_ns)
+                    continue
+                handle(data, addr, now_mono_ns)
+            if len(batch) < max_batch:
+                break
+
+    def _schedule_order_direct(self, order: Order, now_mono_ns: int) -> None:
+        # Zero order latency: the order reaches the book immediately
+        order.ts_ns = now_mono_ns
+        for tr in self.book.add_order(order):
+            self._log_trade(tr)
+
+    def _schedule_order_delayed(self, order: Order, now_mono_ns: int) -> None:
         # Apply a Gaussian latency model, clamped at zero
-        if self.order_latency_mean_ns > 0.0 or self.order_latency_std_ns > 0.0:
-            jitter = random.gauss(self.order_latency_mean_ns, self.order_latency_std_ns)
-            if jitter < 0.0:
-                jitter = 0.0
-        else:
-            jitter = 0.0
-        scheduled_ns = now_mono_ns + int(jitter)
+        scheduled_ns = now_mono_ns + int(self._order_jitter.next())
         # Use the *arrival* time at the book for the internal timestamp
         order.ts_ns = scheduled_ns
-        self._pending_orders.append((scheduled_ns, order))
+        heapq.heappush(self._pending_orders,
+                       (scheduled_ns, next(self._order_arrival_seq), order))
 
     def _process_pending_orders(self, now_mono_ns: int) -> None:
-        if not self._pending_orders:
+        pending = self._pending_orders
+        if pending:
+            heappop = heapq.heappop
+            add_order = self.book.add_order
+            log_trade = self._log_trade
+            while pending and pending[0][0] <= now_mono_ns:
+                _, _, order = heappop(pending)
+                try:
+                    trades = add_order(order)
+                except ValueError as e:
+                    self.log.info(f"[{self.exch_id}] Rejected order "
+                                  f"{order.client_id} {order.order_id}: {e}")
+                    continue
+                for tr in trades:
+                    log_trade(tr)
+        # Also carries fills from orders matched directly on receipt
+        if not self._fill_batch:
             return
-        # _pending_orders is append-only with non-decreasing scheduled_ns,
-        # so we can process from the front.
-        idx = 0
-        n = len(self._pending_orders)
-        while idx < n:
-            scheduled_ns, order = self._pending_orders[idx]
-            if scheduled_ns > now_mono_ns:
-                break
-            trades = self.book.add_order(order)
-            for tr in trades:
-                self._log_trade(tr)
-            idx += 1
-        if idx > 0:
-            del self._pending_orders[:idx]
-
-    def _handle_client_message(self, msg: str, addr: Tuple[str, int]) -> None:
-        parts = msg.split()
+        try:
+            self._fill_batch.flush()
+        except OSError as e:
+            self.log.info(f"[{self.exch_id}] Error sending FILL: {e}")
+
+    def _handle_binary_message(self, data: bytes, addr: Tuple[str, int],
+                               now_mono_ns: int) -> None:
+        op = data[0]
+        try:
+            if op == OP_NEW:
+                (_, client_order_id, raw_client, side_b, type_b,
+                 price, qty) = NEW_FMT.unpack_from(data)
+                side = SIDE_FROM_BYTE.get(side_b)
+                otype = TYPE_FROM_BYTE.get(type_b)
+                if side is None or otype is None:
+                    self.log.info(f"[{self.exch_id}] Bad NEW frame from {addr}: "
+                                  f"side={side_b} type={type_b}")
+                    return
+                order = self._order_pool.get(
+                    order_id=client_order_id,
+                    client_id=decode_client_id(raw_client),
+                    side=side,
+                    type=otype,
+                    price=price,
+                    qty=qty,
+                    ts_ns=now_mono_ns,  # will be overwritten in _schedule_order
+                )
+                self._schedule_order(order, now_mono_ns)
+
+            elif op == OP_CXL:
+                _, client_order_id, raw_client = CXL_FMT.unpack_from(data)
+                ok = self.book.cancel_order(client_order_id)
+                if not ok:
+                    self.log.info(f"[{self.exch_id}] Cancel failed for "
+                                  f"{decode_client_id(raw_client)} {client_order_id}")
+        except Exception as e:
+            self.log.info(f"[{self.exch_id}] Error handling binary msg from {addr}: {e}")
+
+    def _handle_client_message(self, data: bytes, addr: Tuple[str, int],
+                               now_mono_ns: int) -> None:
+        # Legacy text frames are parsed as bytes; only the client_id is
+        # decoded, and only log lines pay for decoding the whole message
+        parts = data.split()
         if not parts:
             return
 
         cmd = parts[0].upper()
-        now_mono_ns = time.monotonic_ns()
 
         try:
-            if cmd == "NEW":
+            if cmd == b"NEW":
                 if len(parts) != 7:
-                    print(f"[{self.exch_id}] Bad NEW msg: {msg}")
+                    self.log.info(f"[{self.exch_id}] Bad NEW msg: {_msg_text(data)}")
                     return
-                client_id = parts[1]
+                side = SIDE_FROM_TOKEN.get(parts[3])
+                otype = TYPE_FROM_TOKEN.get(parts[4])
+                if side is None or otype is None:
+                    self.log.info(f"[{self.exch_id}] Bad NEW msg: {_msg_text(data)}")
+                    return
+                client_id = parts[1].decode("ascii")
                 client_order_id = int(parts[2])
-                side = parts[3].upper()
-                otype = parts[4].upper()
                 price = float(parts[5])
                 qty = float(parts[6])
 
                 internal_oid = client_order_id  # simple mapping
 
-                order = Order(
+                order = self._order_pool.get(
                     order_id=internal_oid,
                     client_id=client_id,
                     side=side,
                     type=otype,
                     price=price,
                     qty=qty,
-                    remaining=qty,
                     ts_ns=now_mono_ns,  # will be overwritten in _schedule_order
                 )
                 self._schedule_order(order, now_mono_ns)
 
-            elif cmd == "CXL":
+            elif cmd == b"CXL":
                 if len(parts) != 3:
-                    print(f"[{self.exch_id}] Bad CXL msg: {msg}")
+                    self.log.info(f"[{self.exch_id}] Bad CXL msg: {_msg_text(data)}")
                     return
-                client_id = parts[1]
                 client_order_id = int(parts[2])
                 internal_oid = client_order_id
                 ok = self.book.cancel_order(internal_oid)
                 if not ok:
-                    print(f"[{self.exch_id}] Cancel failed for {client_id} {client_order_id}")
+                    self.log.info(f"[{self.exch_id}] Cancel failed for "
+                                  f"{_msg_text(parts[1])} {client_order_id}")
             else:
-                print(f"[{self.exch_id}] Unknown command: {msg}")
+                self.log.info(f"[{self.exch_id}] Unknown command: {_msg_text(data)}")
         except Exception as e:
-            print(f"[{self.exch_id}] Error handling client msg '{msg}': {e}")
+            self.log.info(f"[{self.exch_id}] Error handling client msg '{_msg_text(data)}': {e}")
 
     # ---------- trade logging & FILL feed ----------
 
+    def _client_id_to_bytes(self, client_id: str) -> bytes:
+        b = self._client_id_bytes.get(client_id)
+        if b is None:
+            b = client_id.encode("ascii")
+            self._client_id_bytes[client_id] = b
+        return b
+
     def _log_trade(self, tr: Trade) -> None:
-        print(
-            f"[{self.exch_id}] TRADE {tr.symbol} {tr.qty:.4f} @ {tr.price:.2f} "
-            f"(taker={tr.taker_client_id}:{tr.taker_order_id}, "
-            f"maker={tr.maker_client_id}:{tr.maker_order_id})"
-        )
+        if self.log.isEnabledFor(logging.DEBUG):
+            self.log.debug(
+                f"[{self.exch_id}] TRADE {tr.symbol} {tr.qty:.4f} @ {tr.price:.2f} "
+                f"(taker={tr.taker_client_id}:{tr.taker_order_id}, "
+                f"maker={tr.maker_client_id}:{tr.maker_order_id})"
+            )
         # Use REALTIME for on-wire timestamp so BBB can compute feed latency
         send_ts_ns = time.time_ns()
-        msg = (
-            f"FILL {self.exch_id} {tr.symbol} {tr.price:.6f} {tr.qty:.6f} "
-            f"{tr.taker_client_id} {tr.taker_order_id} "
-            f"{tr.maker_client_id} {tr.maker_order_id} {send_ts_ns}"
-        )
+        cid = self._client_id_to_bytes
+        if self.ascii_fills:
+            msg = self._fill_prefix + b"%.6f %.6f %b %d %b %d %d" % (
+                tr.price, tr.qty,
+                cid(tr.taker_client_id), tr.taker_order_id,
+                cid(tr.maker_client_id), tr.maker_order_id,
+                send_ts_ns,
+            )
+        else:
+            msg = FILL_FMT.pack(
+                OP_FILL, self._exch_id_bytes, self._symbol_bytes,
+                tr.price, tr.qty,
+                cid(tr.taker_client_id), tr.taker_order_id,
+                cid(tr.maker_client_id), tr.maker_order_id,
+                send_ts_ns,
+            )
         try:
-            self.fill_sock.sendto(msg.encode("ascii"), self.fill_target)
+            self._fill_batch.add(msg)
         except OSError as e:
-            print(f"[{self.exch_id}] Error sending FILL: {e}")
+            self.log.info(f"[{self.exch_id}] Error sending FILL: {e}")
 
     # ---------- market data feed ----------
 
@@ -348,36 +835,66 @@ class ExchangeSimulator:
 
         self.synthetic_mid = (bid + ask) / 2.0
         self.seq += 1
+        self._enqueue_tick(now_mono_ns, self.seq, bid, ask)
 
-        # Schedule TICK with simulated feed latency.
-        if self.feed_latency_mean_ns > 0.0 or self.feed_latency_std_ns > 0.0:
-            jitter = random.gauss(self.feed_latency_mean_ns, self.feed_latency_std_ns)
-            if jitter < 0.0:
-                jitter = 0.0
-        else:
-            jitter = 0.0
-        scheduled_ns = now_mono_ns + int(jitter)
-        self._pending_ticks.append((scheduled_ns, bid, ask, self.seq))
+    def _send_tick_now(self, now_mono_ns: int, seq: int, bid: float, ask: float) -> None:
+        # Zero feed latency: goes out with this pass's feed batch
+        line = self._tick_prefix + b"%.2f %.2f %d %d" % (bid, ask, seq, time.time_ns())
+        try:
+            self._feed_batch.add(line)
+        except OSError as e:
+            self.log.info(f"[{self.exch_id}] Error sending TICK: {e}")
+
+    def _enqueue_tick_delayed(self, now_mono_ns: int, seq: int,
+                              bid: float, ask: float) -> None:
+        # Schedule TICK with simulated feed latency
+        scheduled_ns = now_mono_ns + int(self._feed_jitter.next())
+        self._pending_ticks.push(scheduled_ns, seq, bid, ask)
 
     def _flush_pending_ticks(self, now_mono_ns: int) -> None:
-        if not self._pending_ticks:
+        pending = self._pending_ticks
+        if not pending:
+            self._flush_feed_batch()
             return
-        idx = 0
-        n = len(self._pending_ticks)
-        while idx < n:
-            scheduled_ns, bid, ask, seq = self._pending_ticks[idx]
-            if scheduled_ns > now_mono_ns:
-                break
+        start, end = pending.pop_due(now_mono_ns)
+        if start == end:
+            self._flush_feed_batch()
+            return
+        tick_prefix = self._tick_prefix
+        wall_ns = time.time_ns
+        add = self._feed_batch.add
+        seqs, bids, asks = pending.seq, pending.bid, pending.ask
+        # Ticks that become due together are packed, '\n'-separated, into
+        # as few datagrams as possible (each kept under MAX_TICK_DATAGRAM)
+        packet = bytearray()
+        for i in range(start, end):
+            seq, bid, ask = seqs[i], bids[i], asks[i]
             # Use REALTIME for the on-wire timestamp
-            send_ts_ns = time.time_ns()
-            msg = f"TICK {self.exch_id} {self.symbol} {bid:.2f} {ask:.2f} {seq} {send_ts_ns}"
+            send_ts_ns = wall_ns()
+            line = tick_prefix + b"%.2f %.2f %d %d" % (bid, ask, seq, send_ts_ns)
+            if packet and len(packet) + 1 + len(line) > MAX_TICK_DATAGRAM:
+                try:
+                    add(bytes(packet))
+                except OSError as e:
+                    self.log.info(f"[{self.exch_id}] Error sending TICK: {e}")
+                packet.clear()
+            if packet:
+                packet += b"\n"
+            packet += line
+        if packet:
             try:
-                self.feed_sock.sendto(msg.encode("ascii"), self.feed_target)
+                add(bytes(packet))
             except OSError as e:
-                print(f"[{self.exch_id}] Error sending TICK: {e}")
-            idx += 1
-        if idx > 0:
-            del self._pending_ticks[:idx]
+                self.log.info(f"[{self.exch_id}] Error sending TICK: {e}")
+        self._flush_feed_batch()
+
+    def _flush_feed_batch(self) -> None:
+        if not self._feed_batch:
+            return
+        try:
+            self._feed_batch.flush()
+        except OSError as e:
+            self.log.info(f"[{self.exch_id}] Error sending TICK: {e}")
 
 
 def main():
@@ -408,6 +925,12 @@ def main():
                         help="Mean simulated market data latency (µs) from book to trader")
     parser.add_argument("--feed-latency-us-std", type=float, default=0.0,
                         help="Std-dev of simulated market data latency (µs)")
+    parser.add_argument("--busy-wait", action="store_true",
+                        help="Poll the order socket without blocking (lower latency, burns a core)")
+    parser.add_argument("--log-trades", action="store_true",
+                        help="Print every trade to the console (off by default; costly under load)")
+    parser.add_argument("--ascii-fills", action="store_true",
+                        help="Send FILLs as text instead of binary frames (for debugging)")
 
     args = parser.parse_args()
 
@@ -428,6 +951,9 @@ def main():
         order_latency_std_us=args.order_latency_us_std,
         feed_latency_mean_us=args.feed_latency_us_mean,
         feed_latency_std_us=args.feed_latency_us_std,
+        busy_wait=args.busy_wait,
+        log_trades=args.log_trades,
+        ascii_fills=args.ascii_fills,
     )
     sim.run()
 
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+match_kernel.py
+
+Inner matching loop for orderbook.py, over one price level stored as
+parallel arrays (SoA):
+
+    rem[head:tail]   remaining int lots per resting order (0: gone)
+    oids / cids      order id / interned client index, same slots
+
+match_level() walks the level in time priority, fills the incoming qty
+and records each fill in caller-owned output columns, so the book only
+touches Python objects once per trade when it builds Trade records.
+Cancelled slots are left in place with rem = 0 and skipped here.
+
+Level storage is always array.array: the book reads and writes single
+slots from Python on every add / cancel / front-of-queue fill, and
+array.array indexes much faster than NumPy scalars from the interpreter.
+
+- With Numba the kernel is also compiled (@njit, nogil=True, cache=True)
+  and match_level() hands it calls that should fill at least
+  JIT_MIN_FILLS makers (that many resting slots, and a taker that many
+  times the front order); below that the call overhead costs more than
+  the loop saves. Most takers fill one maker and stay in Python. The
+  compiled kernel reads the array.array buffers in place and releases
+  the GIL while it runs, so deep books matched on different threads
+  (book_shards.py) overlap there
+- Without it every level goes through the plain Python kernel
+"""
+
+from array import array
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to the pure-Python kernel
+    njit = None
+
+OUT_CAPACITY = 256  # trades recorded per kernel call
+JIT_MIN_FILLS = 8  # expected fills per call before the compiled kernel pays off
+
+
+def _match_level_py(qty, rem, oids, cids, head, tail,
+                    out_oid, out_cid, out_qty, out_rest):
+    """
+    Fill up to 'qty' lots against rem[head:tail], oldest first, writing at most
+    len(out_qty) fills as (maker oid, maker client index, fill qty, maker
+    qty left). Returns (n_fills, qty_left, new_head); new_head skips every
+    fully filled or cancelled slot at the front of the level.
+    """
+    cap = len(out_qty)
+    n = 0
+    i = head
+    while i < tail:
+        r = rem[i]
+        if r <= 0:
+            i += 1
+            continue
+        if qty <= 0 or n == cap:
+            break
+        q = qty if qty < r else r
+        qty -= q
+        r -= q
+        rem[i] = r
+        out_oid[n] = oids[i]
+        out_cid[n] = cids[i]
+        out_qty[n] = q
+        out_rest[n] = r
+        n += 1
+        if r == 0:
+            i += 1
+    return n, qty, i
+
+
+def alloc_i64(n: int):
+    return array("q", bytes(8 * n))
+
+
+def alloc_i16(n: int):
+    return array("h", bytes(2 * n))
+
+
+def grow(col, n: int):
+    # New zeroed column of length n holding col's contents
+    out = array(col.typecode, col)
+    out.extend(array(col.typecode, bytes(col.itemsize * (n - len(col)))))
+    return out
+
+
+if njit is not None:
+    _match_level_jit = njit(nogil=True, cache=True)(_match_level_py)
+
+    def match_level(qty, rem, oids, cids, head, tail,
+                    out_oid, out_cid, out_qty, out_rest):
+        if tail - head < JIT_MIN_FILLS or qty < JIT_MIN_FILLS * rem[head]:
+            return _match_level_py(qty, rem, oids, cids, head, tail,
+                                   out_oid, out_cid, out_qty, out_rest)
+        return _match_level_jit(qty, rem, oids, cids, head, tail,
+                                out_oid, out_cid, out_qty, out_rest)
+
+    # Load (or compile) the kernel at import instead of on the first deep
+    # sweep, which would otherwise stall that order for ~0.1 s
+    _rem = alloc_i64(1)
+    _match_level_jit(0, _rem, alloc_i64(1), alloc_i16(1), 0, 1,
+                     alloc_i64(1), alloc_i16(1), alloc_i64(1), alloc_i64(1))
+    del _rem
+else:
+    match_level = _match_level_py
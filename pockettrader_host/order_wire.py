@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+order_wire.py
+
+Binary order-entry and fill wire formats shared by exchange_sim.py and
+trade_bridge.py.
+
+Frames (little-endian, fixed layout):
+    NEW:  <op=1:u8> <order_id:u64> <client_id:16s> <side:u8> <type:u8>
+          <price:f64> <qty:f64>
+    CXL:  <op=2:u8> <order_id:u64> <client_id:16s>
+    FILL: <op=3:u8> <exch_id:8s> <symbol:8s> <price:f64> <qty:f64>
+          <taker_client:16s> <taker_oid:u64> <maker_client:16s>
+          <maker_oid:u64> <ts_ns:u64>
+
+side / type carry the ASCII codes of 'B'/'S' and 'L'/'M'. client_id,
+exch_id and symbol are NUL-padded to their field width.
+
+Past the parse boundary sides and order types are small ints (SIDE_* /
+TYPE_*); the *_STR tuples map them back for display.
+
+The opcodes are non-printable, so a receiver can tell a binary frame from
+the legacy ASCII "NEW ..." / "CXL ..." / "FILL ..." text messages by the
+first byte.
+"""
+
+import struct
+
+OP_NEW = 1
+OP_CXL = 2
+OP_FILL = 3
+
+SIDE_B = 0
+SIDE_S = 1
+TYPE_L = 0
+TYPE_M = 1
+
+SIDE_STR = ("B", "S")
+TYPE_STR = ("L", "M")
+SIDE_BYTE = (ord("B"), ord("S"))
+TYPE_BYTE = (ord("L"), ord("M"))
+
+NEW_FMT = struct.Struct("<BQ16sBBdd")
+CXL_FMT = struct.Struct("<BQ16s")
+FILL_FMT = struct.Struct("<B8s8sdd16sQ16sQQ")
+
+# Wire byte -> side / type code (lower case accepted)
+SIDE_FROM_BYTE = {ord("B"): SIDE_B, ord("S"): SIDE_S, ord("b"): SIDE_B, ord("s"): SIDE_S}
+TYPE_FROM_BYTE = {ord("L"): TYPE_L, ord("M"): TYPE_M, ord("l"): TYPE_L, ord("m"): TYPE_M}
+
+# Legacy ASCII token -> side / type code, so the text path can look fields
+# up straight from the split bytes
+SIDE_FROM_TOKEN = {b"B": SIDE_B, b"S": SIDE_S, b"b": SIDE_B, b"s": SIDE_S}
+TYPE_FROM_TOKEN = {b"L": TYPE_L, b"M": TYPE_M, b"l": TYPE_L, b"m": TYPE_M}
+
+
+def encode_new(client_id: str, order_id: int, side: int, otype: int,
+               price: float, qty: float) -> bytes:
+    return NEW_FMT.pack(OP_NEW, order_id, client_id.encode("ascii"),
+                        SIDE_BYTE[side], TYPE_BYTE[otype], price, qty)
+
+
+def encode_cxl(client_id: str, order_id: int) -> bytes:
+    return CXL_FMT.pack(OP_CXL, order_id, client_id.encode("ascii"))
+
+
+def encode_fill(exch_id: bytes, symbol: bytes, price: float, qty: float,
+                taker_client: bytes, taker_oid: int,
+                maker_client: bytes, maker_oid: int, ts_ns: int) -> bytes:
+    return FILL_FMT.pack(OP_FILL, exch_id, symbol, price, qty,
+                         taker_client, taker_oid, maker_client, maker_oid, ts_ns)
+
+
+def wire_field(text: str, width: int) -> bytes:
+    # A str as it appears in a fixed-width, NUL-padded frame field
+    return text.encode("ascii").ljust(width, b"\0")
+
+
+def decode_client_id(raw: bytes) -> str:
+    return raw.rstrip(b"\0").decode("ascii")
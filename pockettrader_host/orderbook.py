@@ -9,21 +9,42 @@ Limit order book with:
 - Cancels
 - Top-of-book query
 
-Side: 'B' (buy) or 'S' (sell)
-Type: 'L' (limit) or 'M' (market)
+Side: SIDE_B (buy) or SIDE_S (sell)
+Type: TYPE_L (limit) or TYPE_M (market)
+(int codes from order_wire.py)
+
+Prices are snapped to integer ticks and, inside the book, quantities are
+integer lots (qty * LOT_SCALE), so fills and "fully filled" tests are
+exact; Order / Trade quantities stay floats. Each side is a PriceLadder
+(price_ladder.py) of tick -> Level with a pointer to the best tick, so the
+best price is a plain lookup. A Level keeps its resting orders as parallel
+arrays that match_kernel.match_level() fills against.
 """
 
 from dataclasses import dataclass
-from collections import deque
-from typing import Deque, Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
+from match_kernel import OUT_CAPACITY, alloc_i16, alloc_i64, grow, match_level
+from order_wire import SIDE_B, SIDE_S, TYPE_L, TYPE_M
+from price_ladder import PriceLadder
+
+LOT_SCALE = 100_000_000  # book quantities are int lots of 1e-8 units
+MAX_CLIENTS = 1 << 15  # distinct client ids per book (Level.cids is int16)
+LEVEL_CAPACITY = 16  # initial slots per price level; doubles when full
+
+
+# Explicit __slots__ (rather than dataclass(slots=True), 3.10+) keep
+# Order / Trade free of a per-instance __dict__
 
 @dataclass
 class Order:
+    __slots__ = ("order_id", "client_id", "side", "type", "price", "qty",
+                 "remaining", "ts_ns")
+
     order_id: int
     client_id: str
-    side: str         # 'B' or 'S'
-    type: str         # 'L' or 'M'
+    side: int         # SIDE_B or SIDE_S
+    type: int         # TYPE_L or TYPE_M
     price: float      # limit price, ignored for market
     qty: float        # original quantity
     remaining: float  # remaining quantity
@@ -32,6 +53,9 @@ class Order:
 
 @dataclass
 class Trade:
+    __slots__ = ("symbol", "price", "qty", "taker_order_id", "maker_order_id",
+                 "taker_client_id", "maker_client_id", "ts_ns")
+
     symbol: str
     price: float
     qty: float
@@ -42,68 +66,183 @@ class Trade:
     ts_ns: int
 
 
+class OrderPool:
+    """
+    Free-list of pre-allocated Order objects.
+
+    get() reuses a free Order (allocating only when the list is empty);
+    put() hands it back once the book is done with it.
+    """
+
+    def __init__(self, n: int = 4096):
+        self._free: List[Order] = [Order.__new__(Order) for _ in range(n)]
+
+    def get(self, order_id: int, client_id: str, side: int, type: int,
+            price: float, qty: float, ts_ns: int) -> Order:
+        o = self._free.pop() if self._free else Order.__new__(Order)
+        o.order_id = order_id
+        o.client_id = client_id
+        o.side = side
+        o.type = type
+        o.price = price
+        o.qty = qty
+        o.remaining = qty
+        o.ts_ns = ts_ns
+        return o
+
+    def put(self, o: Order) -> None:
+        self._free.append(o)
+
+
+class Level:
+    """
+    One price level, stored as parallel columns (SoA) over slots
+    [head, tail) in time priority: order id, interned client index and
+    remaining qty in lots. 'total' is the sum of remaining, kept up to date
+    on add / fill / cancel.
+
+    Cancels are soft deletes (rem set to 0) that the matcher skips; the
+    head slot is always live unless the level is empty. push() returns a
+    sequence number that stays valid across compaction: the order's slot
+    is seq - base.
+    """
+    __slots__ = ("price", "tick", "oids", "cids", "rem", "head", "tail", "total",
+                 "base")
+
+    def __init__(self, price: float, tick: int, capacity: int = LEVEL_CAPACITY) -> None:
+        self.price = price
+        self.tick = tick
+        self.oids = alloc_i64(capacity)
+        self.cids = alloc_i16(capacity)
+        self.rem = alloc_i64(capacity)
+        self.head = 0
+        self.tail = 0
+        self.total = 0
+        self.base = 0
+
+    def reset(self, price: float, tick: int) -> None:
+        self.price = price
+        self.tick = tick
+        self.head = 0
+        self.tail = 0
+        self.total = 0
+        self.base = 0
+
+    def push(self, order_id: int, client_idx: int, qty: int) -> int:
+        tail = self.tail
+        if tail == len(self.rem):
+            tail = self._make_room()
+        self.oids[tail] = order_id
+        self.cids[tail] = client_idx
+        self.rem[tail] = qty
+        self.tail = tail + 1
+        self.total += qty
+        return self.base + tail
+
+    def kill(self, slot: int) -> None:
+        # Soft delete: zero the slot, then keep the head on a live order
+        rem = self.rem
+        self.total -= rem[slot]
+        rem[slot] = 0
+        if slot == self.head:
+            head, tail = slot + 1, self.tail
+            while head < tail and rem[head] == 0:
+                head += 1
+            self.head = head
+
+    def _make_room(self) -> int:
+        head, tail = self.head, self.tail
+        if head > 0:
+            # Compact live slots to the front
+            for col in (self.oids, self.cids, self.rem):
+                col[0:tail - head] = col[head:tail]
+            self.head, self.tail = 0, tail - head
+            self.base += head
+        else:
+            n = 2 * len(self.rem)
+            self.oids = grow(self.oids, n)
+            self.cids = grow(self.cids, n)
+            self.rem = grow(self.rem, n)
+        return self.tail
+
+
 class OrderBook:
-    def __init__(self, symbol: str, tick_size: float = 0.01):
+    def __init__(self, symbol: str, tick_size: float = 0.01,
+                 order_pool: Optional[OrderPool] = None, trade_ring: int = 0):
+        if tick_size <= 0:
+            raise ValueError("tick_size must be positive")
+        if trade_ring & (trade_ring - 1):
+            raise ValueError("trade_ring must be 0 or a power of two")
         self.symbol = symbol
         self.tick_size = tick_size
 
-        # price -> deque[Order]
-        self._bids: Dict[float, Deque[Order]] = {}
-        self._asks: Dict[float, Deque[Order]] = {}
+        # When set, every order is returned here once add_order() is done
+        # with it; resting orders live on only as Level columns
+        self.order_pool = order_pool
+
+        # tick -> Level per side, with the best tick tracked
+        self._bids = PriceLadder(is_bid=True)
+        self._asks = PriceLadder(is_bid=False)
 
-        self._bid_prices: List[float] = []
-        self._ask_prices: List[float] = []
+        # Quick lookup for cancels: order_id -> (side, level, seq)
+        self._order_index: Dict[int, Tuple[PriceLadder, Level, int]] = {}
 
-        # Quick lookup for cancels
-        self._order_index: Dict[int, Order] = {}
+        # Emptied levels, reused (with their columns) for new prices
+        self._free_levels: List[Level] = []
+
+        # client_id <-> small int stored in Level.cids
+        self._client_idx: Dict[str, int] = {}
+        self._client_names: List[str] = []
+
+        # Kernel output buffers, reused by every match
+        # (maker oid, maker client index, fill qty, maker qty left)
+        self._out = (alloc_i64(OUT_CAPACITY), alloc_i16(OUT_CAPACITY),
+                     alloc_i64(OUT_CAPACITY), alloc_i64(OUT_CAPACITY))
+
+        # When set, Trades come from this ring and are overwritten
+        # trade_ring trades later: callers must use (or copy) them before
+        # then. Saves an allocation per fill.
+        self._trade_ring: Optional[List[Trade]] = None
+        self._trade_head = 0
+        if trade_ring:
+            self._trade_ring = [Trade.__new__(Trade) for _ in range(trade_ring)]
+            for t in self._trade_ring:
+                t.symbol = symbol
 
         self.last_trade_price: Optional[float] = None
 
     # ---------- helpers ----------
 
-    def _round_price(self, price: float) -> float:
-        if self.tick_size <= 0:
-            return price
-        ticks = round(price / self.tick_size)
-        return ticks * self.tick_size
-
-    def _insert_price_level(self, price_list: List[float], price: float, ascending: bool) -> None:
-        if price in price_list:
-            return
-        price_list.append(price)
-        price_list.sort(reverse=not ascending)
-
-    def _cleanup_price_level(self, side_dict: Dict[float, Deque[Order]],
-                             price_list: List[float], price: float) -> None:
-        q = side_dict.get(price)
-        if not q:
-            side_dict.pop(price, None)
-            if price in price_list:
-                price_list.remove(price)
+    def _intern_client(self, client_id: str) -> int:
+        idx = self._client_idx.get(client_id)
+        if idx is None:
+            idx = len(self._client_names)
+            if idx >= MAX_CLIENTS:
+                raise ValueError(f"more than {MAX_CLIENTS} client ids")
+            self._client_idx[client_id] = idx
+            self._client_names.append(client_id)
+        return idx
 
     # ---------- public API ----------
 
     def best_bid(self) -> Optional[Tuple[float, float]]:
-        if not self._bid_prices:
+        bids = self._bids
+        if bids.best is None:
             return None
-        best_price = max(self._bid_prices)
-        q = self._bids[best_price]
-        total_qty = sum(o.remaining for o in q)
-        return best_price, total_qty
+        level = bids.levels[bids.best]
+        return level.price, level.total / LOT_SCALE
 
     def best_ask(self) -> Optional[Tuple[float, float]]:
-        if not self._ask_prices:
+        asks = self._asks
+        if asks.best is None:
             return None
-        best_price = min(self._ask_prices)
-        q = self._asks[best_price]
-        total_qty = sum(o.remaining for o in q)
-        return best_price, total_qty
+        level = asks.levels[asks.best]
+        return level.price, level.total / LOT_SCALE
 
     def top_of_book(self) -> Tuple[Optional[float], Optional[float]]:
-        bid = self.best_bid()
-        ask = self.best_ask()
-        best_bid = bid[0] if bid else None
-        best_ask = ask[0] if ask else None
+        bids, asks = self._bids, self._asks
+        best_bid = bids.levels[bids.best].price if bids.best is not None else None
+        best_ask = asks.levels[asks.best].price if asks.best is not None else None
         return best_bid, best_ask
 
     def add_order(self, order: Order) -> List[Trade]:
@@ -111,157 +250,174 @@ class OrderBook:
         Add a new order and match against opposite side.
         Returns list of trades generated.
         """
-        if order.side not in ("B", "S"):
-            raise ValueError("side must be 'B' or 'S'")
-        if order.type not in ("L", "M"):
-            raise ValueError("type must be 'L' or 'M'")
-
-        if order.type == "L":
-            order.price = self._round_price(order.price)
-
-        trades: List[Trade] = []
-
-        if order.side == "B":
-            trades = self._match_buy(order)
-            if order.type == "L" and order.remaining > 1e-9:
-                self._add_to_book(self._bids, self._bid_prices,
-                                  price=order.price, order=order, ascending=False)
+        side = order.side
+        if side != SIDE_B and side != SIDE_S:
+            raise ValueError("side must be SIDE_B or SIDE_S")
+        is_limit = order.type == TYPE_L
+        if not is_limit and order.type != TYPE_M:
+            raise ValueError("type must be TYPE_L or TYPE_M")
+
+        tick = 0
+        client = 0
+        if is_limit:
+            tick = round(order.price / self.tick_size)
+            order.price = tick * self.tick_size
+            # Interned before matching, so a full client table rejects the
+            # order before it trades
+            client = self._intern_client(order.client_id)
+
+        if side == SIDE_B:
+            own, opp = self._bids, self._asks
         else:
-            trades = self._match_sell(order)
-            if order.type == "L" and order.remaining > 1e-9:
-                self._add_to_book(self._asks, self._ask_prices,
-                                  price=order.price, order=order, ascending=True)
-
+            own, opp = self._asks, self._bids
+        trades: List[Trade] = []
+        lots = self._match(order, round(order.remaining * LOT_SCALE), is_limit,
+                           tick, opp, trades)
+        order.remaining = lots / LOT_SCALE
+        if is_limit and lots > 0:
+            self._add_to_book(own, order, tick, lots, client)
+
+        # Resting state now lives in the Level columns
+        if self.order_pool is not None:
+            self.order_pool.put(order)
         return trades
 
     def cancel_order(self, order_id: int) -> bool:
-        order = self._order_index.get(order_id)
-        if not order:
-            return False
-        if order.remaining <= 1e-9:
-            self._order_index.pop(order_id, None)
+        entry = self._order_index.pop(order_id, None)
+        if entry is None:
             return False
+        ladder, level, seq = entry
 
-        side_dict = self._bids if order.side == "B" else self._asks
-        price_list = self._bid_prices if order.side == "B" else self._ask_prices
-        price = order.price
-
-        q = side_dict.get(price)
-        if not q:
-            self._order_index.pop(order_id, None)
+        slot = seq - level.base
+        if not (level.head <= slot < level.tail) or level.oids[slot] != order_id \
+                or level.rem[slot] == 0:
             return False
-
-        for o in list(q):
-            if o is order:
-                q.remove(o)
-                self._order_index.pop(order_id, None)
-                if not q:
-                    self._cleanup_price_level(side_dict, price_list, price)
-                return True
-
-        self._order_index.pop(order_id, None)
-        return False
+        level.kill(slot)
+        if level.head == level.tail:
+            ladder.remove(level)
+            self._free_levels.append(level)
+        return True
 
     # ---------- internal matching ----------
 
-    def _add_to_book(self,
-                     side_dict: Dict[float, Deque[Order]],
-                     price_list: List[float],
-                     price: float,
-                     order: Order,
-                     ascending: bool) -> None:
-        if price not in side_dict:
-            side_dict[price] = deque()
-            self._insert_price_level(price_list, price, ascending=ascending)
-        side_dict[price].append(order)
-        self._order_index[order.order_id] = order
-
-    def _match_buy(self, order: Order) -> List[Trade]:
-        trades: List[Trade] = []
-        while order.remaining > 1e-9 and self._ask_prices:
-            best_ask_price = min(self._ask_prices)
-            if order.type == "L" and best_ask_price > order.price + 1e-12:
-                break
-
-            level_queue = self._asks[best_ask_price]
-            while level_queue and order.remaining > 1e-9:
-                resting = level_queue[0]
-                trade_qty = min(order.remaining, resting.remaining)
-                if trade_qty <= 0:
-                    break
-
-                trade_price = best_ask_price
-                trade = Trade(
-                    symbol=self.symbol,
-                    price=trade_price,
-                    qty=trade_qty,
-                    taker_order_id=order.order_id,
-                    maker_order_id=resting.order_id,
-                    taker_client_id=order.client_id,
-                    maker_client_id=resting.client_id,
-                    ts_ns=order.ts_ns,
-                )
-                trades.append(trade)
-                self.last_trade_price = trade_price
-
-                order.remaining -= trade_qty
-                resting.remaining -= trade_qty
-
-                if resting.remaining <= 1e-9:
-                    level_queue.popleft()
-                    self._order_index.pop(resting.order_id, None)
-
-                if order.remaining <= 1e-9:
-                    break
-
-            if not level_queue:
-                self._cleanup_price_level(self._asks, self._ask_prices, best_ask_price)
-            if order.type == "M" and not self._ask_prices:
+    def _add_to_book(self, ladder: PriceLadder, order: Order, tick: int,
+                     lots: int, client: int) -> None:
+        level = ladder.levels.get(tick)
+        if level is None:
+            if self._free_levels:
+                level = self._free_levels.pop()
+                level.reset(order.price, tick)
+            else:
+                level = Level(order.price, tick)
+            # Only a level that holds an order goes on the ladder
+            seq = level.push(order.order_id, client, lots)
+            ladder.insert(level)
+        else:
+            seq = level.push(order.order_id, client, lots)
+        self._order_index[order.order_id] = (ladder, level, seq)
+
+    def _match(self, order: Order, lots: int, is_limit: bool, tick: int,
+               opp: PriceLadder, trades: List[Trade]) -> int:
+        # Fill 'lots' of 'order' against the opposite side, best level
+        # first; returns the lots left
+        levels = opp.levels
+        sign = opp.sign
+        while lots > 0 and opp.best is not None:
+            best_tick = opp.best
+            if is_limit and sign * (best_tick - tick) > 0:
                 break
-
-        return trades
-
-    def _match_sell(self, order: Order) -> List[Trade]:
-        trades: List[Trade] = []
-        while order.remaining > 1e-9 and self._bid_prices:
-            best_bid_price = max(self._bid_prices)
-            if order.type == "L" and best_bid_price < order.price - 1e-12:
+            level = levels[best_tick]
+            lots = self._fill_level(order, lots, level.price, level, trades)
+            if level.head == level.tail:
+                opp.remove(level)
+                self._free_levels.append(level)
+        return lots
+
+    def _fill_level(self, order: Order, lots: int, price: float, level: Level,
+                    trades: List[Trade]) -> int:
+        rem = level.rem
+        head = level.head
+        front = int(rem[head])
+        if lots < front:
+            # Common case: the front order absorbs the whole taker, so skip
+            # the kernel call and its output buffers
+            rem[head] = front - lots
+            level.total -= lots
+            qty = lots / LOT_SCALE
+            self.last_trade_price = price
+            ring = self._trade_ring
+            if ring is not None and len(trades) < len(ring):
+                i = self._trade_head
+                self._trade_head = (i + 1) & (len(ring) - 1)
+                t = ring[i]
+                t.price = price
+                t.qty = qty
+                t.taker_order_id = order.order_id
+                t.maker_order_id = int(level.oids[head])
+                t.taker_client_id = order.client_id
+                t.maker_client_id = self._client_names[level.cids[head]]
+                t.ts_ns = order.ts_ns
+                trades.append(t)
+                return 0
+            trades.append(Trade(
+                symbol=self.symbol,
+                price=price,
+                qty=qty,
+                taker_order_id=order.order_id,
+                maker_order_id=int(level.oids[head]),
+                taker_client_id=order.client_id,
+                maker_client_id=self._client_names[level.cids[head]],
+                ts_ns=order.ts_ns,
+            ))
+            return 0
+
+        out_oid, out_cid, out_qty, out_rest = self._out
+        names = self._client_names
+        index = self._order_index
+        symbol = self.symbol
+        ring = self._trade_ring
+        filled = 0
+        while True:
+            n, left, head = match_level(lots, level.rem, level.oids, level.cids,
+                                        level.head, level.tail,
+                                        out_oid, out_cid, out_qty, out_rest)
+            lots = left
+            level.head = head
+            if not n:
                 break
-
-            level_queue = self._bids[best_bid_price]
-            while level_queue and order.remaining > 1e-9:
-                resting = level_queue[0]
-                trade_qty = min(order.remaining, resting.remaining)
-                if trade_qty <= 0:
-                    break
-
-                trade_price = best_bid_price
-                trade = Trade(
-                    symbol=self.symbol,
-                    price=trade_price,
-                    qty=trade_qty,
-                    taker_order_id=order.order_id,
-                    maker_order_id=resting.order_id,
-                    taker_client_id=order.client_id,
-                    maker_client_id=resting.client_id,
-                    ts_ns=order.ts_ns,
-                )
-                trades.append(trade)
-                self.last_trade_price = trade_price
-
-                order.remaining -= trade_qty
-                resting.remaining -= trade_qty
-
-                if resting.remaining <= 1e-9:
-                    level_queue.popleft()
-                    self._order_index.pop(resting.order_id, None)
-
-                if order.remaining <= 1e-9:
-                    break
-
-            if not level_queue:
-                self._cleanup_price_level(self._bids, self._bid_prices, best_bid_price)
-            if order.type == "M" and not self._bid_prices:
+            self.last_trade_price = price
+            # A ring can't hand out more slots than it has within one call
+            use_ring = ring is not None and len(trades) + n <= len(ring)
+            for maker_oid, cid, q, rest in zip(out_oid[:n].tolist(), out_cid[:n].tolist(),
+                                               out_qty[:n].tolist(), out_rest[:n].tolist()):
+                qty = q / LOT_SCALE
+                if use_ring:
+                    i = self._trade_head
+                    self._trade_head = (i + 1) & (len(ring) - 1)
+                    t = ring[i]
+                    t.price = price
+                    t.qty = qty
+                    t.taker_order_id = order.order_id
+                    t.maker_order_id = maker_oid
+                    t.taker_client_id = order.client_id
+                    t.maker_client_id = names[cid]
+                    t.ts_ns = order.ts_ns
+                else:
+                    t = Trade(
+                        symbol=symbol,
+                        price=price,
+                        qty=qty,
+                        taker_order_id=order.order_id,
+                        maker_order_id=maker_oid,
+                        taker_client_id=order.client_id,
+                        maker_client_id=names[cid],
+                        ts_ns=order.ts_ns,
+                    )
+                trades.append(t)
+                filled += q
+                if rest == 0:
+                    index.pop(maker_oid, None)
+            if n < OUT_CAPACITY:
                 break
-
-        return trades
+        level.total -= filled
+        return lots
@@ -0,0 +1,514 @@
+# distutils: language = c++
+# cython: language_level=3, cdivision=True, boundscheck=False, wraparound=False
+"""
+orderbook.pyx
+
+Cython build of orderbook.py with the same public API (Order, Trade,
+OrderPool, OrderBook) and the same matching behaviour, for CPython
+deployments where matching throughput matters.
+
+- Order / Trade are cdef classes with typed fields
+- Prices snap to integer ticks and book quantities are int lots
+  (qty * LOT_SCALE), as in orderbook.py; both sides are the shared
+  PriceLadder from price_ladder.py
+- A Level keeps its columns (order id, client index, lots left) in C
+  arrays, and _match_level() is a C port of match_kernel.match_level(),
+  filling in the same OUT_CAPACITY batches so optional trade_ring reuse
+  lines up with orderbook.py
+- Cancels are soft deletes on the level columns, and every order goes
+  back to order_pool once add_order() is done with it
+
+Build in place as the module orderbook_c (needs Cython and a C++
+compiler):
+
+    python setup.py build_ext --inplace
+
+exchange_sim.py imports orderbook_c when it is built and falls back to
+orderbook.py otherwise; delete the built .so to go back to the
+pure-Python book. Keep this file in step with orderbook.py.
+"""
+
+from libc.math cimport rint
+from libc.stdlib cimport free, malloc, realloc
+from libc.string cimport memmove
+
+from order_wire import SIDE_B as _SIDE_B, SIDE_S as _SIDE_S, TYPE_L as _TYPE_L, TYPE_M as _TYPE_M
+from price_ladder import PriceLadder
+
+# C-level copies of the order_wire codes, so comparisons stay in C
+cdef int SIDE_B = _SIDE_B
+cdef int SIDE_S = _SIDE_S
+cdef int TYPE_L = _TYPE_L
+cdef int TYPE_M = _TYPE_M
+
+# Same values as orderbook.py / match_kernel.py
+LOT_SCALE = 100_000_000  # book quantities are int lots of 1e-8 units
+MAX_CLIENTS = 1 << 15  # distinct client ids per book (Level.cids is int16)
+LEVEL_CAPACITY = 16  # initial slots per price level; doubles when full
+cdef double C_LOT_SCALE = LOT_SCALE
+cdef Py_ssize_t C_MAX_CLIENTS = MAX_CLIENTS
+cdef enum:
+    OUT_CAPACITY = 256  # fills recorded per _match_level() call
+
+
+cdef class Order:
+    cdef public long long order_id
+    cdef public str client_id
+    cdef public int side         # SIDE_B or SIDE_S
+    cdef public int type         # TYPE_L or TYPE_M
+    cdef public double price     # limit price, ignored for market
+    cdef public double qty       # original quantity
+    cdef public double remaining # remaining quantity
+    cdef public long long ts_ns  # receive time
+
+    def __init__(self, long long order_id, str client_id, int side, int type,
+                 double price, double qty, double remaining, long long ts_ns):
+        self.order_id = order_id
+        self.client_id = client_id
+        self.side = side
+        self.type = type
+        self.price = price
+        self.qty = qty
+        self.remaining = remaining
+        self.ts_ns = ts_ns
+
+    def __repr__(self):
+        return (f"Order(order_id={self.order_id!r}, client_id={self.client_id!r}, "
+                f"side={self.side!r}, type={self.type!r}, price={self.price!r}, "
+                f"qty={self.qty!r}, remaining={self.remaining!r}, ts_ns={self.ts_ns!r})")
+
+
+cdef class Trade:
+    cdef public str symbol
+    cdef public double price
+    cdef public double qty
+    cdef public long long taker_order_id
+    cdef public long long maker_order_id
+    cdef public str taker_client_id
+    cdef public str maker_client_id
+    cdef public long long ts_ns
+
+    def __init__(self, str symbol, double price, double qty,
+                 long long taker_order_id, long long maker_order_id,
+                 str taker_client_id, str maker_client_id, long long ts_ns):
+        self.symbol = symbol
+        self.price = price
+        self.qty = qty
+        self.taker_order_id = taker_order_id
+        self.maker_order_id = maker_order_id
+        self.taker_client_id = taker_client_id
+        self.maker_client_id = maker_client_id
+        self.ts_ns = ts_ns
+
+    def __repr__(self):
+        return (f"Trade(symbol={self.symbol!r}, price={self.price!r}, qty={self.qty!r}, "
+                f"taker_order_id={self.taker_order_id!r}, "
+                f"maker_order_id={self.maker_order_id!r}, "
+                f"taker_client_id={self.taker_client_id!r}, "
+                f"maker_client_id={self.maker_client_id!r}, ts_ns={self.ts_ns!r})")
+
+
+cdef class OrderPool:
+    """
+    Free-list of pre-allocated Order objects.
+
+    get() reuses a free Order (allocating only when the list is empty);
+    put() hands it back once the book is done with it.
+    """
+    cdef list _free
+
+    def __init__(self, int n=4096):
+        self._free = [Order.__new__(Order) for _ in range(n)]
+
+    cpdef Order get(self, long long order_id, str client_id, int side, int type,
+                    double price, double qty, long long ts_ns):
+        cdef Order o = self._free.pop() if self._free else Order.__new__(Order)
+        o.order_id = order_id
+        o.client_id = client_id
+        o.side = side
+        o.type = type
+        o.price = price
+        o.qty = qty
+        o.remaining = qty
+        o.ts_ns = ts_ns
+        return o
+
+    cpdef put(self, Order o):
+        self._free.append(o)
+
+
+cdef class Level:
+    """
+    One price level as C columns over slots [head, tail) in time priority;
+    see orderbook.Level. push() returns a sequence number that stays valid
+    across compaction: the order's slot is seq - base.
+    """
+    cdef public double price
+    cdef public long long tick
+    cdef long long* oids
+    cdef short* cids
+    cdef long long* rem
+    cdef Py_ssize_t cap
+    cdef Py_ssize_t head
+    cdef Py_ssize_t tail
+    cdef Py_ssize_t base
+    cdef long long total
+
+    def __cinit__(self, double price, long long tick):
+        self.price = price
+        self.tick = tick
+        self.cap = LEVEL_CAPACITY
+        self.oids = <long long*>malloc(self.cap * sizeof(long long))
+        self.cids = <short*>malloc(self.cap * sizeof(short))
+        self.rem = <long long*>malloc(self.cap * sizeof(long long))
+        if self.oids == NULL or self.cids == NULL or self.rem == NULL:
+            raise MemoryError()
+
+    def __dealloc__(self):
+        free(self.oids)
+        free(self.cids)
+        free(self.rem)
+
+    cdef inline void reset(self, double price, long long tick):
+        self.price = price
+        self.tick = tick
+        self.head = 0
+        self.tail = 0
+        self.total = 0
+        self.base = 0
+
+    cdef Py_ssize_t push(self, long long order_id, short client_idx,
+                         long long qty) except -1:
+        cdef Py_ssize_t tail = self.tail
+        if tail == self.cap:
+            tail = self._make_room()
+        self.oids[tail] = order_id
+        self.cids[tail] = client_idx
+        self.rem[tail] = qty
+        self.tail = tail + 1
+        self.total += qty
+        return self.base + tail
+
+    cdef void kill(self, Py_ssize_t slot):
+        # Soft delete: zero the slot, then keep the head on a live order
+        cdef Py_ssize_t head
+        self.total -= self.rem[slot]
+        self.rem[slot] = 0
+        if slot == self.head:
+            head = slot + 1
+            while head < self.tail and self.rem[head] == 0:
+                head += 1
+            self.head = head
+
+    cdef Py_ssize_t _make_room(self) except -1:
+        cdef Py_ssize_t head = self.head, n = self.tail - self.head
+        cdef void* p
+        if head > 0:
+            # Compact live slots to the front
+            memmove(self.oids, self.oids + head, n * sizeof(long long))
+            memmove(self.cids, self.cids + head, n * sizeof(short))
+            memmove(self.rem, self.rem + head, n * sizeof(long long))
+            self.head, self.tail = 0, n
+            self.base += head
+        else:
+            n = 2 * self.cap
+            p = realloc(self.oids, n * sizeof(long long))
+            if p == NULL:
+                raise MemoryError()
+            self.oids = <long long*>p
+            p = realloc(self.cids, n * sizeof(short))
+            if p == NULL:
+                raise MemoryError()
+            self.cids = <short*>p
+            p = realloc(self.rem, n * sizeof(long long))
+            if p == NULL:
+                raise MemoryError()
+            self.rem = <long long*>p
+            self.cap = n
+        return self.tail
+
+
+cdef Py_ssize_t _match_level(long long* qty, Level level,
+                             long long* out_oid, short* out_cid,
+                             long long* out_qty, long long* out_rest) noexcept:
+    # C port of match_kernel.match_level(): fill up to *qty against the
+    # level, oldest first, recording at most OUT_CAPACITY fills; leaves the
+    # lots still unfilled in *qty and the level head past spent slots
+    cdef long long* rem = level.rem
+    cdef long long q, r, left = qty[0]
+    cdef Py_ssize_t n = 0, i = level.head, tail = level.tail
+    while i < tail:
+        r = rem[i]
+        if r <= 0:
+            i += 1
+            continue
+        if left <= 0 or n == OUT_CAPACITY:
+            break
+        q = left if left < r else r
+        left -= q
+        r -= q
+        rem[i] = r
+        out_oid[n] = level.oids[i]
+        out_cid[n] = level.cids[i]
+        out_qty[n] = q
+        out_rest[n] = r
+        n += 1
+        if r == 0:
+            i += 1
+    qty[0] = left
+    level.head = i
+    return n
+
+
+cdef class OrderBook:
+    cdef public str symbol
+    cdef public double tick_size
+    cdef public object order_pool
+    cdef public object last_trade_price
+
+    # tick -> Level per side, with the best tick tracked
+    cdef object _bids
+    cdef object _asks
+    # Quick lookup for cancels: order_id -> (side, level, seq)
+    cdef dict _order_index
+    # Emptied levels, reused (with their columns) for new prices
+    cdef list _free_levels
+    # client_id <-> small int stored in Level.cids
+    cdef dict _client_idx
+    cdef list _client_names
+    # Optional Trade ring (see orderbook.py)
+    cdef list _trade_ring
+    cdef Py_ssize_t _trade_head
+
+    # Match output, reused by every _match_level() call
+    # (maker oid, maker client index, fill qty, maker qty left)
+    cdef long long _out_oid[OUT_CAPACITY]
+    cdef short _out_cid[OUT_CAPACITY]
+    cdef long long _out_qty[OUT_CAPACITY]
+    cdef long long _out_rest[OUT_CAPACITY]
+
+    def __init__(self, str symbol, double tick_size=0.01, order_pool=None,
+                 int trade_ring=0):
+        cdef Trade t
+        if tick_size <= 0:
+            raise ValueError("tick_size must be positive")
+        if trade_ring & (trade_ring - 1):
+            raise ValueError("trade_ring must be 0 or a power of two")
+        self.symbol = symbol
+        self.tick_size = tick_size
+
+        # When set, every order is returned here once add_order() is done
+        # with it; resting orders live on only as Level columns
+        self.order_pool = order_pool
+
+        self._bids = PriceLadder(is_bid=True)
+        self._asks = PriceLadder(is_bid=False)
+        self._order_index = {}
+        self._free_levels = []
+        self._client_idx = {}
+        self._client_names = []
+
+        self._trade_ring = None
+        self._trade_head = 0
+        if trade_ring:
+            self._trade_ring = [Trade.__new__(Trade) for _ in range(trade_ring)]
+            for t in self._trade_ring:
+                t.symbol = symbol
+
+        self.last_trade_price = None
+
+    # ---------- helpers ----------
+
+    cdef short _intern_client(self, str client_id) except -1:
+        idx = self._client_idx.get(client_id)
+        if idx is None:
+            idx = len(self._client_names)
+            if idx >= C_MAX_CLIENTS:
+                raise ValueError(f"more than {MAX_CLIENTS} client ids")
+            self._client_idx[client_id] = idx
+            self._client_names.append(client_id)
+        return idx
+
+    cdef inline Trade _next_trade(self):
+        # Take the next ring slot; its symbol is already set
+        cdef Py_ssize_t i = self._trade_head
+        self._trade_head = (i + 1) & (len(self._trade_ring) - 1)
+        return <Trade>self._trade_ring[i]
+
+    # ---------- public API ----------
+
+    def best_bid(self):
+        cdef Level level
+        if self._bids.best is None:
+            return None
+        level = self._bids.levels[self._bids.best]
+        return level.price, level.total / C_LOT_SCALE
+
+    def best_ask(self):
+        cdef Level level
+        if self._asks.best is None:
+            return None
+        level = self._asks.levels[self._asks.best]
+        return level.price, level.total / C_LOT_SCALE
+
+    def top_of_book(self):
+        bids, asks = self._bids, self._asks
+        best_bid = (<Level>bids.levels[bids.best]).price if bids.best is not None else None
+        best_ask = (<Level>asks.levels[asks.best]).price if asks.best is not None else None
+        return best_bid, best_ask
+
+    cpdef list add_order(self, Order order):
+        """
+        Add a new order and match against opposite side.
+        Returns list of trades generated.
+        """
+        if order.side != SIDE_B and order.side != SIDE_S:
+            raise ValueError("side must be SIDE_B or SIDE_S")
+        cdef bint is_limit = order.type == TYPE_L
+        if not is_limit and order.type != TYPE_M:
+            raise ValueError("type must be TYPE_L or TYPE_M")
+
+        cdef long long tick = 0, lots
+        cdef short client = 0
+        if is_limit:
+            # rint() rounds half to even, like Python's round()
+            tick = <long long>rint(order.price / self.tick_size)
+            order.price = tick * self.tick_size
+            # Interned before matching, so a full client table rejects the
+            # order before it trades
+            client = self._intern_client(order.client_id)
+
+        if order.side == SIDE_B:
+            own, opp = self._bids, self._asks
+        else:
+            own, opp = self._asks, self._bids
+        cdef list trades = []
+        lots = self._match(order, <long long>rint(order.remaining * C_LOT_SCALE),
+                           is_limit, tick, opp, trades)
+        order.remaining = lots / C_LOT_SCALE
+        if is_limit and lots > 0:
+            self._add_to_book(own, order, tick, lots, client)
+
+        # Resting state now lives in the Level columns
+        if self.order_pool is not None:
+            self.order_pool.put(order)
+        return trades
+
+    cpdef bint cancel_order(self, long long order_id):
+        entry = self._order_index.pop(order_id, None)
+        if entry is None:
+            return False
+        ladder, level_obj, seq = entry
+        cdef Level level = <Level>level_obj
+
+        cdef Py_ssize_t slot = seq - level.base
+        if not (level.head <= slot < level.tail) or level.oids[slot] != order_id \
+                or level.rem[slot] == 0:
+            return False
+        level.kill(slot)
+        if level.head == level.tail:
+            ladder.remove(level)
+            self._free_levels.append(level)
+        return True
+
+    # ---------- internal matching ----------
+
+    cdef int _add_to_book(self, object ladder, Order order, long long tick,
+                          long long lots, short client) except -1:
+        cdef Level level
+        cdef Py_ssize_t seq
+        level_obj = ladder.levels.get(tick)
+        if level_obj is None:
+            if self._free_levels:
+                level = <Level>self._free_levels.pop()
+                level.reset(order.price, tick)
+            else:
+                level = Level(order.price, tick)
+            # Only a level that holds an order goes on the ladder
+            seq = level.push(order.order_id, client, lots)
+            ladder.insert(level)
+        else:
+            level = <Level>level_obj
+            seq = level.push(order.order_id, client, lots)
+        self._order_index[order.order_id] = (ladder, level, seq)
+        return 0
+
+    cdef long long _match(self, Order order, long long lots, bint is_limit,
+                          long long tick, object opp, list trades) except -1:
+        # Fill 'lots' of 'order' against the opposite side, best level
+        # first; returns the lots left
+        cdef dict levels = opp.levels
+        cdef long long sign = opp.sign
+        cdef Level level
+        while lots > 0:
+            best = opp.best
+            if best is None:
+                break
+            if is_limit and sign * (<long long>best - tick) > 0:
+                break
+            level = <Level>levels[best]
+            lots = self._fill_level(order, lots, level, trades)
+            if level.head == level.tail:
+                opp.remove(level)
+                self._free_levels.append(level)
+        return lots
+
+    cdef long long _fill_level(self, Order order, long long lots, Level level,
+                               list trades) except -1:
+        cdef double price = level.price
+        cdef Py_ssize_t head = level.head, n, k
+        cdef long long front = level.rem[head], filled = 0
+        cdef bint use_ring
+        cdef Trade t
+        cdef list ring = self._trade_ring
+        cdef list names = self._client_names
+        cdef dict index = self._order_index
+        if lots < front:
+            # Common case: the front order absorbs the whole taker
+            level.rem[head] = front - lots
+            level.total -= lots
+            self.last_trade_price = price
+            if ring is not None and len(trades) < len(ring):
+                t = self._next_trade()
+            else:
+                t = Trade.__new__(Trade)
+                t.symbol = self.symbol
+            t.price = price
+            t.qty = lots / C_LOT_SCALE
+            t.taker_order_id = order.order_id
+            t.maker_order_id = level.oids[head]
+            t.taker_client_id = order.client_id
+            t.maker_client_id = names[level.cids[head]]
+            t.ts_ns = order.ts_ns
+            trades.append(t)
+            return 0
+
+        while True:
+            n = _match_level(&lots, level, self._out_oid, self._out_cid,
+                             self._out_qty, self._out_rest)
+            if not n:
+                break
+            self.last_trade_price = price
+            # A ring can't hand out more slots than it has within one call
+            use_ring = ring is not None and len(trades) + n <= len(ring)
+            for k in range(n):
+                if use_ring:
+                    t = self._next_trade()
+                else:
+                    t = Trade.__new__(Trade)
+                    t.symbol = self.symbol
+                t.price = price
+                t.qty = self._out_qty[k] / C_LOT_SCALE
+                t.taker_order_id = order.order_id
+                t.maker_order_id = self._out_oid[k]
+                t.taker_client_id = order.client_id
+                t.maker_client_id = names[self._out_cid[k]]
+                t.ts_ns = order.ts_ns
+                trades.append(t)
+                filled += self._out_qty[k]
+                if self._out_rest[k] == 0:
+                    index.pop(self._out_oid[k], None)
+            if n < OUT_CAPACITY:
+                break
+        level.total -= filled
+        return lots
@@ -9,49 +9,47 @@ Reads arb_log.csv produced by trade_bridge.py and plots:
 3) P&L per trade vs trade index
 """
 
-import csv
 import matplotlib.pyplot as plt
+import numpy as np
 
 
 def load_arb_log(path: str = "arb_log.csv"):
-    trade_idx = []
-    pnl = []
-    spreads = []
-
-    with open(path, "r", newline="") as f:
-        reader = csv.DictReader(f)
-        for i, row in enumerate(reader):
-            try:
-                pnl_val = float(row["pnl"])
-                spread_val = float(row["spread_realized"])
-            except (KeyError, ValueError) as e:
-                print(f"[PLOT] Skip row {i}: {e}")
-                continue
-
-            trade_idx.append(len(trade_idx))
-            pnl.append(pnl_val)
-            spreads.append(spread_val)
-
+    """
+    Returns (trade_idx, pnl, spreads) as NumPy arrays. Rows with the wrong
+    number of columns, or whose spread_realized / pnl do not parse, are
+    skipped.
+    """
+    # genfromtxt drops rows with the wrong column count without saying how
+    # many, so count the data rows (non-blank lines after the header) first
+    with open(path, "rb") as f:
+        n_rows = sum(1 for line in f.read().splitlines()[1:] if line.strip())
+
+    data = np.genfromtxt(path, delimiter=",", names=True,
+                         usecols=("spread_realized", "pnl"),
+                         dtype=np.float64, invalid_raise=False)
+    data = np.atleast_1d(data)
+    spreads = data["spread_realized"]
+    pnl = data["pnl"]
+
+    ok = ~(np.isnan(spreads) | np.isnan(pnl))
+    skipped = n_rows - np.count_nonzero(ok)
+    if skipped:
+        print(f"[PLOT] Skipped {skipped} unparsable row(s)")
+    spreads = spreads[ok]
+    pnl = pnl[ok]
+
+    trade_idx = np.arange(pnl.size)
     return trade_idx, pnl, spreads
 
 
-def compute_cum_pnl(pnl):
-    cum = []
-    running = 0.0
-    for v in pnl:
-        running += v
-        cum.append(running)
-    return cum
-
-
 def main():
     trade_idx, pnl, spreads = load_arb_log("arb_log.csv")
 
-    if not trade_idx:
+    if trade_idx.size == 0:
         print("[PLOT] No valid rows in arb_log.csv")
         return
 
-    cum_pnl = compute_cum_pnl(pnl)
+    cum_pnl = np.cumsum(pnl)
 
     # 1) Cumulative P&L
     plt.figure()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+price_ladder.py
+
+One side of an order book as tick -> level, with the best tick tracked.
+Shared by orderbook.py and its Cython build (orderbook.pyx), so both order
+levels the same way; a level only needs a 'tick' attribute here.
+"""
+
+from bisect import bisect_left, insort
+from typing import Any, Dict, List, Optional
+
+LADDER_TICKS = 4096  # initial tick span of a PriceLadder; doubles as needed
+MAX_LADDER_TICKS = 1 << 22  # widest tick window per side; beyond it, 'far'
+
+
+class PriceLadder:
+    """
+    One side of the book: tick -> level, plus the best tick.
+
+    'occ' is a byte per tick (1 = level present) over [base, base +
+    len(occ)); when the best level goes away the next one is found with
+    bytearray.find / rfind (a memchr), not a Python loop over empty ticks.
+    The window grows up to MAX_LADDER_TICKS; levels beyond it (far-off
+    limit prices) are kept in the small sorted list 'far' instead.
+    """
+    __slots__ = ("levels", "occ", "base", "best", "is_bid", "sign", "far")
+
+    def __init__(self, is_bid: bool) -> None:
+        self.levels: Dict[int, Any] = {}
+        self.occ = bytearray(LADDER_TICKS)
+        self.base = 0
+        self.best: Optional[int] = None  # best tick, None when empty
+        self.is_bid = is_bid
+        # +1 for asks, -1 for bids: sign * (tick - limit_tick) > 0 means
+        # the level is worse than a taker's limit
+        self.sign = -1 if is_bid else 1
+        self.far: List[int] = []
+
+    def insert(self, level: Any) -> None:
+        tick = level.tick
+        if not self.levels:
+            # Empty side: re-centre on the new level, occ is all zeros
+            self.base = tick - len(self.occ) // 2
+        i = tick - self.base
+        if not 0 <= i < len(self.occ):
+            i = self._grow(i)
+        if i < 0:
+            insort(self.far, tick)
+        else:
+            self.occ[i] = 1
+        self.levels[tick] = level
+        best = self.best
+        if best is None or (tick > best if self.is_bid else tick < best):
+            self.best = tick
+
+    def remove(self, level: Any) -> None:
+        tick = level.tick
+        del self.levels[tick]
+        occ = self.occ
+        i = tick - self.base
+        if 0 <= i < len(occ):
+            occ[i] = 0
+        else:
+            far = self.far
+            del far[bisect_left(far, tick)]
+        if tick != self.best:
+            return
+        # Next best: nearest occupied tick past i, or the best far level
+        if self.is_bid:
+            j = occ.rfind(1, 0, min(max(i, 0), len(occ)))
+        else:
+            j = occ.find(1, max(i + 1, 0))
+        best = None if j < 0 else self.base + j
+        if self.far:
+            f = self.far[-1] if self.is_bid else self.far[0]
+            if best is None or (f > best if self.is_bid else f < best):
+                best = f
+        self.best = best
+
+    def _grow(self, i: int) -> int:
+        # Widen occ (at least doubling) to cover index i; returns i rebased,
+        # or -1 if that would pass MAX_LADDER_TICKS
+        n = len(self.occ)
+        if i < 0:
+            if n - i > MAX_LADDER_TICKS:
+                return -1
+            k = max(-i, min(n, MAX_LADDER_TICKS - n))
+            self.occ[0:0] = bytes(k)
+            self.base -= k
+            i += k
+        else:
+            if i + 1 > MAX_LADDER_TICKS:
+                return -1
+            self.occ.extend(bytes(max(i + 1 - n, min(n, MAX_LADDER_TICKS - n))))
+        # Far levels the window now covers move into occ
+        base, end = self.base, self.base + len(self.occ)
+        for t in [t for t in self.far if base <= t < end]:
+            self.far.remove(t)
+            self.occ[t - base] = 1
+        return i
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+setup.py
+
+Builds the optional Cython order book (orderbook.pyx -> orderbook_c) for
+CPython deployments:
+
+    python setup.py build_ext --inplace
+
+exchange_sim.py uses orderbook_c when it can import it and orderbook.py
+otherwise. On PyPy nothing is built: there the pure-Python book (JIT
+compiled) is faster than a C extension reached through cpyext.
+"""
+
+import platform
+
+from setuptools import Extension, setup
+
+ext_modules = []
+if platform.python_implementation() == "CPython":
+    from Cython.Build import cythonize
+
+    ext_modules = cythonize(
+        [Extension("orderbook_c", ["orderbook.pyx"], language="c++")],
+        compiler_directives={"language_level": "3"},
+    )
+
+setup(name="pockettrader-host", ext_modules=ext_modules)
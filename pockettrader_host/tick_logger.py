@@ -4,7 +4,7 @@ tick_logger.py
 
 Listens to EXA and EXB market data feeds and logs ticks to CSV.
 
-Expected message:
+Expected message (one or more '\n'-separated lines per datagram):
     TICK <EXCH_ID> <SYMBOL> <bid> <ask> <seq> <ts_ns>
 
 Outputs:
@@ -13,22 +13,34 @@ Outputs:
 
 Columns:
     ts_ns_host, exch, symbol, bid, ask, seq
+
+Each ready socket is drained in one go (recvmmsg batches on Linux).
+Rows are buffered per file and written in batches (every FLUSH_ROWS rows
+or FLUSH_INTERVAL_S seconds), not flushed per tick.
 """
 
+import selectors
 import socket
-import select
 import time
-import csv
+
+from udp_batch import UdpRecvBatch
 
 LISTEN_IP = "0.0.0.0"
 EXA_PORT = 6001
 EXB_PORT = 6002
 
+FLUSH_ROWS = 256
+FLUSH_INTERVAL_S = 0.1
+FILE_BUFFER_BYTES = 1 << 16
+RCVBUF_BYTES = 1 << 22
+
 
 def create_udp_socket(port: int) -> socket.socket:
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RCVBUF_BYTES)
     sock.bind((LISTEN_IP, port))
+    sock.setblocking(False)
     return sock
 
 
@@ -39,68 +51,105 @@ def main():
     print(f"[TICK_LOGGER] Listening EXA ticks on {LISTEN_IP}:{EXA_PORT}")
     print(f"[TICK_LOGGER] Listening EXB ticks on {LISTEN_IP}:{EXB_PORT}")
 
-    exa_file = open("exa_ticks.csv", "w", newline="")
-    exb_file = open("exb_ticks.csv", "w", newline="")
-
-    exa_writer = csv.writer(exa_file)
-    exb_writer = csv.writer(exb_file)
-
-    header = ["ts_ns_host", "exch", "symbol", "bid", "ask", "seq"]
-    exa_writer.writerow(header)
-    exb_writer.writerow(header)
-    exa_file.flush()
-    exb_file.flush()
+    exa_file = open("exa_ticks.csv", "w", newline="", buffering=FILE_BUFFER_BYTES)
+    exb_file = open("exb_ticks.csv", "w", newline="", buffering=FILE_BUFFER_BYTES)
+
+    header = "ts_ns_host,exch,symbol,bid,ask,seq\n"
+    exa_file.write(header)
+    exb_file.write(header)
+
+    # Pending CSV lines per file, written with one write() per batch
+    exa_buf = []
+    exb_buf = []
+    last_flush = time.monotonic()
+
+    def flush_rows():
+        if exa_buf:
+            exa_file.write("".join(exa_buf))
+            exa_file.flush()
+            exa_buf.clear()
+        if exb_buf:
+            exb_file.write("".join(exb_buf))
+            exb_file.flush()
+            exb_buf.clear()
+
+    def handle_datagram(s, data, addr, ts_ns_host):
+        # One datagram may carry several '\n'-separated TICK lines
+        text = data.decode("ascii", errors="ignore")
+        for msg in text.splitlines():
+            msg = msg.strip()
+            if not msg:
+                continue
+            parts = msg.split()
+
+            if len(parts) != 7 or parts[0].upper() != "TICK":
+                print(f"[TICK_LOGGER] Bad TICK from {addr}: {msg}")
+                continue
+
+            _, exch, symbol, bid_str, ask_str, seq_str, ts_ns_str = parts
+
+            try:
+                bid = float(bid_str)
+                ask = float(ask_str)
+                seq = int(seq_str)
+            except ValueError:
+                print(f"[TICK_LOGGER] Parse error: {msg}")
+                continue
+
+            exch_up = exch.upper()
+
+            row = f"{ts_ns_host},{exch_up},{symbol},{bid},{ask},{seq}\n"
+
+            if s is exa_sock or exch_up == "EXA":
+                exa_buf.append(row)
+            elif s is exb_sock or exch_up == "EXB":
+                exb_buf.append(row)
+            else:
+                # Unknown exchange, ignore
+                continue
+
+    # epoll on Linux; registered once, each key carries its batch receiver
+    sel = selectors.DefaultSelector()
+    sel.register(exa_sock, selectors.EVENT_READ, UdpRecvBatch(exa_sock))
+    sel.register(exb_sock, selectors.EVENT_READ, UdpRecvBatch(exb_sock))
 
     try:
         while True:
-            read_socks, _, _ = select.select([exa_sock, exb_sock], [], [], 0.5)
-
-            for s in read_socks:
-                try:
-                    data, addr = s.recvfrom(4096)
-                except OSError:
-                    continue
-
-                msg = data.decode("ascii", errors="ignore").strip()
-                parts = msg.split()
-
-                if len(parts) != 7 or parts[0].upper() != "TICK":
-                    print(f"[TICK_LOGGER] Bad TICK from {addr}: {msg}")
-                    continue
-
-                _, exch, symbol, bid_str, ask_str, seq_str, ts_ns_str = parts
-
-                try:
-                    bid = float(bid_str)
-                    ask = float(ask_str)
-                    seq = int(seq_str)
-                except ValueError:
-                    print(f"[TICK_LOGGER] Parse error: {msg}")
-                    continue
-
-                ts_ns_host = time.time_ns()
-                exch_up = exch.upper()
-
-                row = [ts_ns_host, exch_up, symbol, bid, ask, seq]
-
-                if s is exa_sock or exch_up == "EXA":
-                    exa_writer.writerow(row)
-                    exa_file.flush()
-                elif s is exb_sock or exch_up == "EXB":
-                    exb_writer.writerow(row)
-                    exb_file.flush()
-                else:
-                    # Unknown exchange, ignore
-                    continue
+            # Block while idle; only wake on a timer when rows are waiting
+            timeout = FLUSH_INTERVAL_S if (exa_buf or exb_buf) else None
+            for key, _ in sel.select(timeout):
+                s = key.fileobj
+                receiver = key.data
+                # Drain everything queued on this socket, a batch per syscall
+                while True:
+                    try:
+                        batch = receiver.recv()
+                    except OSError:
+                        break
+                    # One host timestamp per batch; its datagrams were
+                    # already queued together
+                    ts_ns_host = time.time_ns()
+                    for data, addr in batch:
+                        handle_datagram(s, data, addr, ts_ns_host)
+                    if len(batch) < receiver.max_batch:
+                        break
+
+            now = time.monotonic()
+            if (len(exa_buf) >= FLUSH_ROWS or len(exb_buf) >= FLUSH_ROWS
+                    or now - last_flush > FLUSH_INTERVAL_S):
+                flush_rows()
+                last_flush = now
 
     except KeyboardInterrupt:
         print("\n[TICK_LOGGER] Stopped by user")
     finally:
         try:
+            flush_rows()
             exa_file.close()
             exb_file.close()
         except Exception:
             pass
+        sel.close()
         exa_sock.close()
         exb_sock.close()
 
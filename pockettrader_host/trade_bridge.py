@@ -8,24 +8,44 @@ Bridges PocketTrader (BBB) and the exchange simulators.
     TRADE <strategy_id> <legA_exch> <legA_side> <legA_price>
           <legB_exch> <legB_side> <legB_price> <size> <spread> <ts_ns>
 
-- Sends real client orders into exchanges:
+- Sends real client orders into exchanges as binary NEW frames
+  (order_wire.py), or as ASCII when ORDER_WIRE_BINARY is False:
     NEW PT <order_id> <side> L <price> <qty>
 
-- Listens for FILL messages from exchanges:
+- Listens for FILL messages from exchanges, as binary FILL frames
+  (order_wire.py, one struct unpack) or as text:
     FILL <EXCH_ID> <SYMBOL> <price> <qty>
          <taker_client> <taker_oid> <maker_client> <maker_oid> <ts_ns>
 
 - Aggregates fills per arbitrage and prints realized P&L when both legs filled.
 - Logs each completed arbitrage to arb_log.csv for P&L / spread analysis.
+
+Runs on an asyncio selector event loop (also on Windows, where the
+default Proactor loop has no add_reader()): the listening sockets are
+epoll/select readers drained a recvmmsg() batch at a time. Completed arb_log rows are
+preformatted strings appended to an in-memory buffer; one os.write() on
+the raw fd writes them out about once a second (a call_later timer, armed
+only when a row is buffered, so an idle bridge never wakes up) and again
+on shutdown.
+Console lines go through console_log.py's queued logger; per-order and
+per-FILL lines are DEBUG records, printed only with --log-legs.
 """
 
+import argparse
+import asyncio
+import logging
+import signal
 import socket
-import select
+import sys
 import time
-import csv
 import os
 from dataclasses import dataclass
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Tuple
+
+from console_log import start_console_log
+from order_wire import (FILL_FMT, NEW_FMT, OP_FILL, OP_NEW, SIDE_B, SIDE_BYTE,
+                        SIDE_S, SIDE_STR, TYPE_BYTE, TYPE_L, wire_field)
+from udp_batch import UdpRecvBatch
 
 TRADE_LISTEN_IP = "0.0.0.0"
 TRADE_LISTEN_PORT = 7000  # must match BBB trade_port
@@ -39,13 +59,33 @@ ORDER_PORTS = {
     "EXB": 9102,
 }
 
+# Exchange / side names are mapped to small ints once, at message ingress
+EXCH_NAMES = tuple(ORDER_PORTS)
+EXCH_FROM_NAME = {name: i for i, name in enumerate(EXCH_NAMES)}
+# exch_id field of a binary FILL frame (NUL-padded)
+EXCH_FROM_WIRE = {wire_field(name, 8): i for i, name in enumerate(EXCH_NAMES)}
+SIDE_FROM_NAME = {"BUY": SIDE_B, "SELL": SIDE_S}
+
+# order_to_arb key: exchange code in the top byte, order id below it
+EXCH_SHIFT = 56
+
+LEG_A = 0
+LEG_B = 1
+LEG_NAMES = ("A", "B")
+
 CLIENT_ID = "PT"
 
+# Binary order frames; set False to send the human-readable ASCII format
+ORDER_WIRE_BINARY = True
+
+RCVBUF_BYTES = 1 << 22
+ARB_LOG_FLUSH_S = 1.0  # buffered arb_log.csv rows are written this long after the first
+
 
 @dataclass
 class LegState:
-    exch: str
-    side: str        # "BUY" or "SELL"
+    exch: int        # index into EXCH_NAMES
+    side: int        # SIDE_B or SIDE_S
     target_qty: float
     filled_qty: float
     weighted_price_sum: float
@@ -54,81 +94,133 @@ class LegState:
 @dataclass
 class ArbState:
     arb_id: int
-    legs: Dict[str, LegState]  # "A" / "B"
+    legs: Tuple[LegState, LegState]  # indexed by LEG_A / LEG_B
     closed: bool = False
 
 
 class TradeBridge:
-    def __init__(self):
+    def __init__(self, log_legs: bool = False):
+        # Console output is enqueued here and written by a listener thread,
+        # so the message path never blocks on stdout. log_legs turns on the
+        # DEBUG lines for every order sent and FILL received.
+        self.log, self._log_listener = start_console_log(
+            "bridge", logging.DEBUG if log_legs else logging.INFO)
+
         # TRADE listener (BBB -> bridge)
         self.trade_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self.trade_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.trade_sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RCVBUF_BYTES)
         self.trade_sock.bind((TRADE_LISTEN_IP, TRADE_LISTEN_PORT))
+        self.trade_sock.setblocking(False)
 
         # FILL listener (exchanges -> bridge)
         self.fill_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self.fill_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.fill_sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RCVBUF_BYTES)
         self.fill_sock.bind((FILL_LISTEN_IP, FILL_LISTEN_PORT))
+        self.fill_sock.setblocking(False)
+
+        # Batch receivers, drained from the event loop's reader callbacks
+        self._trade_recv = UdpRecvBatch(self.trade_sock)
+        self._fill_recv = UdpRecvBatch(self.fill_sock)
 
         # Order send socket (shared)
         self.order_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
 
+        # Per-exchange destinations and constant order fields, built once
+        self._order_addrs: Tuple[Tuple[str, int], ...] = tuple(
+            (ORDER_TARGET_HOST, ORDER_PORTS[name]) for name in EXCH_NAMES
+        )
+        self._client_id_bytes = CLIENT_ID.encode("ascii")
+        self._client_id_wire = wire_field(CLIENT_ID, 16)
+        self._new_prefix = f"NEW {CLIENT_ID} ".encode("ascii")
+
         # Order and arb tracking
         self.next_arb_id = 1
         self.next_order_id = 1
 
-        # (exch, order_id) -> (arb_id, leg_key)
-        self.order_to_arb: Dict[Tuple[str, int], Tuple[int, str]] = {}
+        # (exch << EXCH_SHIFT) | order_id -> (arb_id, leg)
+        self.order_to_arb: Dict[int, Tuple[int, int]] = {}
         self.arbs: Dict[int, ArbState] = {}
 
-        # CSV log for realized arbitrages
-        self.arb_log = open("arb_log.csv", "w", newline="")
-        self.arb_writer = csv.writer(self.arb_log)
-        self.arb_writer.writerow([
-            "arb_id",
-            "timestamp_iso",
-            "size",
-            "buy_px",
-            "sell_px",
-            "spread_realized",
-            "pnl",
-        ])
-        self.arb_log.flush()
-
-        print(f"[BRIDGE] Listening TRADE on {TRADE_LISTEN_IP}:{TRADE_LISTEN_PORT}")
-        print(f"[BRIDGE] Listening FILL  on {FILL_LISTEN_IP}:{FILL_LISTEN_PORT}")
+        # CSV log for realized arbitrages. Rows are buffered here and
+        # written by _flush_arb_log(), never on the fill path itself.
+        self._arb_fd = os.open("arb_log.csv",
+                               os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        os.write(self._arb_fd,
+                 b"arb_id,timestamp_iso,size,buy_px,sell_px,spread_realized,pnl\n")
+        self._arb_rows: List[bytes] = []
+        self._arb_flush: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.log.info(f"[BRIDGE] Listening TRADE on {TRADE_LISTEN_IP}:{TRADE_LISTEN_PORT}")
+        self.log.info(f"[BRIDGE] Listening FILL  on {FILL_LISTEN_IP}:{FILL_LISTEN_PORT}")
 
     # ---------- main loop ----------
 
     def run(self):
+        if sys.platform == "win32":
+            # add_reader() needs a selector loop; Windows defaults to Proactor
+            asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
         try:
-            while True:
-                read_socks, _, _ = select.select(
-                    [self.trade_sock, self.fill_sock], [], [], 0.1
-                )
-                for s in read_socks:
-                    if s is self.trade_sock:
-                        data, addr = s.recvfrom(4096)
-                        msg = data.decode("ascii", errors="ignore").strip()
-                        self.handle_trade_msg(msg, addr)
-                    elif s is self.fill_sock:
-                        data, addr = s.recvfrom(4096)
-                        msg = data.decode("ascii", errors="ignore").strip()
-                        self.handle_fill_msg(msg, addr)
+            asyncio.run(self._serve())
         except KeyboardInterrupt:
-            print("[BRIDGE] Stopped by user")
+            self.log.info("[BRIDGE] Stopped by user")
         finally:
             try:
-                self.arb_log.close()
+                self._flush_arb_log()
+                os.close(self._arb_fd)
             except Exception:
                 pass
+            # Writes out whatever is still queued
+            self._log_listener.stop()
+
+    async def _serve(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._loop = loop
+        loop.add_reader(self.trade_sock, self._drain,
+                        self._trade_recv, self.handle_trade_msg)
+        loop.add_reader(self.fill_sock, self._drain,
+                        self._fill_recv, self.handle_fill_msg)
+        # The scenario scripts stop the bridge with SIGTERM; end the loop
+        # normally on it so run() still closes the log and drains the console
+        stop = loop.create_future()
+        try:
+            loop.add_signal_handler(signal.SIGTERM,
+                                    lambda: stop.done() or stop.set_result(None))
+            on_sigterm = True
+        except NotImplementedError:
+            # Windows event loops have no signal handlers; Ctrl+C still works
+            on_sigterm = False
+        try:
+            await stop  # until SIGTERM, or cancelled (Ctrl+C)
+            self.log.info("[BRIDGE] Stopped by SIGTERM")
+        finally:
+            if on_sigterm:
+                loop.remove_signal_handler(signal.SIGTERM)
+            loop.remove_reader(self.trade_sock)
+            loop.remove_reader(self.fill_sock)
+            if self._arb_flush is not None:
+                self._arb_flush.cancel()
+                self._arb_flush = None
+            self._loop = None
+
+    def _drain(self, receiver: UdpRecvBatch, handle) -> None:
+        # Read until the socket is empty, instead of one datagram per select()
+        while True:
+            batch = receiver.recv()
+            for data, addr in batch:
+                handle(data, addr)
+            if len(batch) < receiver.max_batch:
+                break
 
     # ---------- TRADE handling (BBB -> bridge) ----------
 
-    def handle_trade_msg(self, msg: str, addr):
+    def handle_trade_msg(self, data: bytes, addr):
+        msg = data.decode("ascii", errors="ignore").strip()
         parts = msg.split()
         if len(parts) != 11 or parts[0].upper() != "TRADE":
-            print(f"[BRIDGE] Bad TRADE msg from {addr}: {msg}")
+            self.log.info(f"[BRIDGE] Bad TRADE msg from {addr}: {msg}")
             return
 
         (
@@ -151,13 +243,24 @@ class TradeBridge:
             size = float(size_str)
             spread = float(spread_str)
         except ValueError:
-            print(f"[BRIDGE] TRADE parse error: {msg}")
+            self.log.info(f"[BRIDGE] TRADE parse error: {msg}")
+            return
+
+        legA_exch_id = EXCH_FROM_NAME.get(legA_exch.upper())
+        legB_exch_id = EXCH_FROM_NAME.get(legB_exch.upper())
+        if legA_exch_id is None or legB_exch_id is None:
+            self.log.info(f"[BRIDGE] Unknown exchange in TRADE: {msg}")
+            return
+        legA_side_id = SIDE_FROM_NAME.get(legA_side.upper())
+        legB_side_id = SIDE_FROM_NAME.get(legB_side.upper())
+        if legA_side_id is None or legB_side_id is None:
+            self.log.info(f"[BRIDGE] Invalid side in TRADE: {msg}")
             return
 
         arb_id = self.next_arb_id
         self.next_arb_id += 1
 
-        print(
+        self.log.info(
             f"[BRIDGE] TRADE#{arb_id} from BBB: "
             f"{legA_exch} {legA_side} {legA_price} / "
             f"{legB_exch} {legB_side} {legB_price}, "
@@ -165,105 +268,114 @@ class TradeBridge:
         )
 
         legA = LegState(
-            exch=legA_exch,
-            side=legA_side,
+            exch=legA_exch_id,
+            side=legA_side_id,
             target_qty=size,
             filled_qty=0.0,
             weighted_price_sum=0.0,
         )
         legB = LegState(
-            exch=legB_exch,
-            side=legB_side,
+            exch=legB_exch_id,
+            side=legB_side_id,
             target_qty=size,
             filled_qty=0.0,
             weighted_price_sum=0.0,
         )
-        self.arbs[arb_id] = ArbState(arb_id=arb_id, legs={"A": legA, "B": legB})
+        self.arbs[arb_id] = ArbState(arb_id=arb_id, legs=(legA, legB))
 
         # Send actual orders into exchanges
-        self._send_leg_order(arb_id, "A", legA, legA_price, size)
-        self._send_leg_order(arb_id, "B", legB, legB_price, size)
+        self._send_leg_order(arb_id, LEG_A, legA, legA_price, size)
+        self._send_leg_order(arb_id, LEG_B, legB, legB_price, size)
 
-    def _send_leg_order(self, arb_id: int, leg_key: str,
+    def _send_leg_order(self, arb_id: int, leg_key: int,
                         leg: LegState, price: float, qty: float) -> None:
-        exch = leg.exch.upper()
-        port = ORDER_PORTS.get(exch)
-        if port is None:
-            print(f"[BRIDGE] Unknown exchange '{exch}' for arb#{arb_id}")
-            return
+        # exch / side were validated when the TRADE came in
+        exch = leg.exch
+        side_byte = SIDE_BYTE[leg.side]
 
         order_id = self.next_order_id
         self.next_order_id += 1
 
-        # Map BUY/SELL -> B/S for the exchange
-        if leg.side.upper() == "BUY":
-            side_char = "B"
-        elif leg.side.upper() == "SELL":
-            side_char = "S"
+        if ORDER_WIRE_BINARY:
+            payload = NEW_FMT.pack(OP_NEW, order_id, self._client_id_bytes,
+                                   side_byte, TYPE_BYTE[TYPE_L], price, qty)
         else:
-            print(f"[BRIDGE] Invalid side {leg.side} for arb#{arb_id}")
-            return
+            payload = self._new_prefix + b"%d %c L %.6f %.6f" % (
+                order_id, side_byte, price, qty)
+        self.order_sock.sendto(payload, self._order_addrs[exch])
 
-        msg = f"NEW {CLIENT_ID} {order_id} {side_char} L {price:.6f} {qty:.6f}"
-        self.order_sock.sendto(
-            msg.encode("ascii"),
-            (ORDER_TARGET_HOST, port),
-        )
-
-        self.order_to_arb[(exch, order_id)] = (arb_id, leg_key)
+        self.order_to_arb[(exch << EXCH_SHIFT) | order_id] = (arb_id, leg_key)
 
-        print(
-            f"[BRIDGE] Sent order EXCH={exch} OID={order_id} "
-            f"LEG={leg_key} SIDE={side_char} PX={price:.2f} QTY={qty:.4f}"
-        )
+        if self.log.isEnabledFor(logging.DEBUG):
+            self.log.debug(
+                f"[BRIDGE] Sent order EXCH={EXCH_NAMES[exch]} OID={order_id} "
+                f"LEG={LEG_NAMES[leg_key]} SIDE={SIDE_STR[leg.side]} PX={price:.2f} QTY={qty:.4f}"
+            )
 
     # ---------- FILL handling (exchange -> bridge) ----------
 
-    def handle_fill_msg(self, msg: str, addr):
-        parts = msg.split()
-        if len(parts) != 10 or parts[0].upper() != "FILL":
-            print(f"[BRIDGE] Bad FILL msg from {addr}: {msg}")
-            return
-
-        (
-            _,
-            exch_id,
-            symbol,
-            price_str,
-            qty_str,
-            taker_client,
-            taker_oid_str,
-            maker_client,
-            maker_oid_str,
-            ts_ns_str,
-        ) = parts
+    def handle_fill_msg(self, data: bytes, addr):
+        if data and data[0] == OP_FILL:
+            if len(data) != FILL_FMT.size:
+                self.log.info(f"[BRIDGE] Bad FILL frame from {addr}: {len(data)} bytes")
+                return
+            (_, exch_id, _symbol, price, qty, taker_client, taker_oid,
+             maker_client, maker_oid, _ts_ns) = FILL_FMT.unpack(data)
+            exch = EXCH_FROM_WIRE.get(exch_id)
+            our_id = self._client_id_wire
+        else:
+            # Text FILL; str split + float() is still the quickest way to
+            # take this one apart in CPython
+            msg = data.decode("ascii", errors="ignore").strip()
+            parts = msg.split()
+            if len(parts) != 10 or parts[0].upper() != "FILL":
+                self.log.info(f"[BRIDGE] Bad FILL msg from {addr}: {msg}")
+                return
+
+            (
+                _,
+                exch_id,
+                symbol,
+                price_str,
+                qty_str,
+                taker_client,
+                taker_oid_str,
+                maker_client,
+                maker_oid_str,
+                ts_ns_str,
+            ) = parts
 
-        try:
-            price = float(price_str)
-            qty = float(qty_str)
-            taker_oid = int(taker_oid_str)
-            maker_oid = int(maker_oid_str)
-        except ValueError:
-            print(f"[BRIDGE] FILL parse error: {msg}")
+            try:
+                price = float(price_str)
+                qty = float(qty_str)
+                taker_oid = int(taker_oid_str)
+                maker_oid = int(maker_oid_str)
+            except ValueError:
+                self.log.info(f"[BRIDGE] FILL parse error: {msg}")
+                return
+
+            exch = EXCH_FROM_NAME.get(exch_id.upper())
+            our_id = CLIENT_ID
+
+        if exch is None:
+            self.log.info(f"[BRIDGE] FILL from unknown exchange {exch_id!r} ({addr})")
             return
 
-        exch_id = exch_id.upper()
-
         # We only care about fills for our client_id
         candidates = []
-        if taker_client == CLIENT_ID:
+        if taker_client == our_id:
             candidates.append((taker_oid, "taker"))
-        if maker_client == CLIENT_ID:
+        if maker_client == our_id:
             candidates.append((maker_oid, "maker"))
 
         if not candidates:
             return  # fill between other participants
 
         for oid, role in candidates:
-            key = (exch_id, oid)
+            key = (exch << EXCH_SHIFT) | oid
             mapping = self.order_to_arb.get(key)
             if not mapping:
-                print(f"[BRIDGE] FILL for unknown order {exch_id}:{oid}: {msg}")
+                self.log.info(f"[BRIDGE] FILL for unknown order {EXCH_NAMES[exch]}:{oid}")
                 continue
 
             arb_id, leg_key = mapping
@@ -275,14 +387,14 @@ class TradeBridge:
             leg.filled_qty += qty
             leg.weighted_price_sum += price * qty
 
-            avg_price = leg.weighted_price_sum / max(leg.filled_qty, 1e-12)
-
-            print(
-                f"[BRIDGE] FILL arb#{arb_id} LEG={leg_key} "
-                f"EXCH={exch_id} ROLE={role} "
-                f"px={price:.2f} qty={qty:.4f} "
-                f"filled={leg.filled_qty:.4f} avg_px={avg_price:.4f}"
-            )
+            if self.log.isEnabledFor(logging.DEBUG):
+                avg_price = leg.weighted_price_sum / max(leg.filled_qty, 1e-12)
+                self.log.debug(
+                    f"[BRIDGE] FILL arb#{arb_id} LEG={LEG_NAMES[leg_key]} "
+                    f"EXCH={EXCH_NAMES[exch]} ROLE={role} "
+                    f"px={price:.2f} qty={qty:.4f} "
+                    f"filled={leg.filled_qty:.4f} avg_px={avg_price:.4f}"
+                )
 
             self._maybe_finalize_arb(arb_id)
 
@@ -291,8 +403,7 @@ class TradeBridge:
         if not arb or arb.closed:
             return
 
-        legA = arb.legs["A"]
-        legB = arb.legs["B"]
+        legA, legB = arb.legs
 
         # Require both legs fully filled
         if legA.filled_qty + 1e-9 < legA.target_qty:
@@ -304,7 +415,7 @@ class TradeBridge:
         avgB = legB.weighted_price_sum / legB.filled_qty
 
         # Identify which leg is buy / sell
-        if legA.side.upper() == "BUY":
+        if legA.side == SIDE_B:
             buy_px, sell_px = avgA, avgB
         else:
             buy_px, sell_px = avgB, avgA
@@ -315,29 +426,42 @@ class TradeBridge:
 
         arb.closed = True
 
-        print(
+        self.log.info(
             f"[ARB] DONE #{arb_id} size={size:.4f} "
             f"buy={buy_px:.2f} sell={sell_px:.2f} "
             f"spread_realized={spread_realized:.4f} pnl={pnl:.4f}"
         )
 
         # Log completed arbitrage to CSV
-        if hasattr(self, "arb_writer"):
+        if hasattr(self, "_arb_fd"):
             ts_iso = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
-            self.arb_writer.writerow([
-                arb_id,
-                ts_iso,
-                size,
-                buy_px,
-                sell_px,
-                spread_realized,
-                pnl,
-            ])
-            self.arb_log.flush()
+            # All fields are numbers or a fixed-format timestamp, so no
+            # quoting is needed and csv.writer can be skipped
+            self._arb_rows.append((
+                f"{arb_id},{ts_iso},{size:.8f},{buy_px:.8f},{sell_px:.8f},"
+                f"{spread_realized:.8f},{pnl:.8f}\n"
+            ).encode("ascii"))
+            if self._arb_flush is None and self._loop is not None:
+                self._arb_flush = self._loop.call_later(ARB_LOG_FLUSH_S,
+                                                        self._flush_arb_log)
+
+    def _flush_arb_log(self) -> None:
+        # One write for every row buffered since the last flush
+        self._arb_flush = None
+        if self._arb_rows:
+            data = memoryview(b"".join(self._arb_rows))
+            self._arb_rows.clear()
+            while data:
+                data = data[os.write(self._arb_fd, data):]
 
 
 def main():
-    bridge = TradeBridge()
+    parser = argparse.ArgumentParser(description="PocketTrader <-> exchange simulator bridge")
+    parser.add_argument("--log-legs", action="store_true",
+                        help="Print every order sent and FILL received (off by default; costly under load)")
+    args = parser.parse_args()
+
+    bridge = TradeBridge(log_legs=args.log_legs)
     bridge.run()
 
 
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+udp_batch.py
+
+Batched UDP send/receive helpers for the exchange simulator.
+
+- UdpSendBatch collects (payload, addr) datagrams for one socket and
+  flushes them with a single Linux sendmmsg() call (via ctypes)
+- UdpRecvBatch pulls up to N queued datagrams with a single recvmmsg()
+- Both fall back to sequential sendto()/recvfrom() where the batched
+  syscalls are unavailable (macOS / Windows / libc without the symbol)
+- A datagram queued with addr=None goes to the socket's connect()ed peer
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import socket
+import struct
+import sys
+from typing import Dict, List, Optional, Tuple
+
+MAX_BATCH = 64
+RECV_BATCH = 32
+RECV_BUF_SIZE = 4096
+
+MSG_DONTWAIT = getattr(socket, "MSG_DONTWAIT", 0x40)
+
+
+class _IoVec(ctypes.Structure):
+    _fields_ = [
+        ("iov_base", ctypes.c_char_p),
+        ("iov_len", ctypes.c_size_t),
+    ]
+
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(_IoVec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_hdr", _MsgHdr),
+        ("msg_len", ctypes.c_uint),
+    ]
+
+
+class _SockAddrIn(ctypes.Structure):
+    _fields_ = [
+        ("sin_family", ctypes.c_ushort),
+        ("sin_port", ctypes.c_uint16),   # network byte order
+        ("sin_addr", ctypes.c_uint8 * 4),
+        ("sin_zero", ctypes.c_uint8 * 8),
+    ]
+
+
+def _load_libc_fn(name: str, argtypes):
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fn = getattr(libc, name)
+    except (OSError, AttributeError):
+        return None
+    fn.argtypes = argtypes
+    fn.restype = ctypes.c_int
+    return fn
+
+
+_sendmmsg = _load_libc_fn(
+    "sendmmsg", [ctypes.c_int, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int])
+_recvmmsg = _load_libc_fn(
+    "recvmmsg", [ctypes.c_int, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_void_p])
+
+
+class UdpSendBatch:
+    def __init__(self, sock: socket.socket, max_batch: int = MAX_BATCH):
+        self.sock = sock
+        self.max_batch = max_batch
+        self._pending: List[Tuple[bytes, Optional[Tuple[str, int]]]] = []
+
+        # Pre-allocated iovec / mmsghdr arrays, reused across flushes
+        self._use_mmsg = _sendmmsg is not None and sock.family == socket.AF_INET
+        if self._use_mmsg:
+            self._iov = (_IoVec * max_batch)()
+            self._msgs = (_MMsgHdr * max_batch)()
+            for i in range(max_batch):
+                hdr = self._msgs[i].msg_hdr
+                hdr.msg_iov = ctypes.pointer(self._iov[i])
+                hdr.msg_iovlen = 1
+            # addr -> packed sockaddr_in
+            self._sockaddrs: Dict[Tuple[str, int], ctypes.Array] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, payload: bytes, addr: Optional[Tuple[str, int]] = None) -> None:
+        self._pending.append((payload, addr))
+        if len(self._pending) >= self.max_batch:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Send every queued datagram. Raises OSError on the first send failure;
+        queued datagrams are dropped either way, matching sendto() semantics.
+        """
+        if not self._pending:
+            return
+        pending = self._pending
+        self._pending = []
+        if self._use_mmsg:
+            self._flush_mmsg(pending)
+        else:
+            for payload, addr in pending:
+                self._send_one(payload, addr)
+
+    # ---------- internals ----------
+
+    def _send_one(self, payload: bytes, addr: Optional[Tuple[str, int]]) -> None:
+        for attempt in (0, 1):
+            try:
+                if addr is None:
+                    self.sock.send(payload)
+                else:
+                    self.sock.sendto(payload, addr)
+                return
+            except ConnectionRefusedError:
+                # Connected UDP socket reporting an earlier ICMP port
+                # unreachable; the error is consumed, so retry once
+                if attempt:
+                    raise
+
+    def _sockaddr(self, addr: Tuple[str, int]) -> ctypes.Array:
+        sa = self._sockaddrs.get(addr)
+        if sa is None:
+            packed = struct.pack("=H", socket.AF_INET) + struct.pack("!H", addr[1])
+            packed += socket.inet_aton(socket.gethostbyname(addr[0])) + bytes(8)
+            sa = ctypes.create_string_buffer(packed, len(packed))
+            self._sockaddrs[addr] = sa
+        return sa
+
+    def _flush_mmsg(self, pending: List[Tuple[bytes, Optional[Tuple[str, int]]]]) -> None:
+        n = len(pending)
+        for i, (payload, addr) in enumerate(pending):
+            self._iov[i].iov_base = payload
+            self._iov[i].iov_len = len(payload)
+            hdr = self._msgs[i].msg_hdr
+            if addr is None:
+                hdr.msg_name = None
+                hdr.msg_namelen = 0
+            else:
+                sa = self._sockaddr(addr)
+                hdr.msg_name = ctypes.addressof(sa)
+                hdr.msg_namelen = len(sa)
+
+        fd = self.sock.fileno()
+        base = ctypes.addressof(self._msgs)
+        sent = 0
+        refused = False
+        while sent < n:
+            rc = _sendmmsg(fd, base + sent * ctypes.sizeof(_MMsgHdr), n - sent, 0)
+            if rc < 0:
+                err = ctypes.get_errno()
+                if err == errno.ECONNREFUSED and not refused:
+                    # See _send_one(): stale ICMP error, nothing was sent
+                    refused = True
+                    continue
+                raise OSError(err, os.strerror(err))
+            sent += rc
+
+
+class UdpRecvBatch:
+    def __init__(self, sock: socket.socket,
+                 max_batch: int = RECV_BATCH, buf_size: int = RECV_BUF_SIZE):
+        self.sock = sock
+        self.max_batch = max_batch
+        self.buf_size = buf_size
+
+        # Pre-allocated receive buffers / source addresses, reused across calls
+        self._use_mmsg = _recvmmsg is not None and sock.family == socket.AF_INET
+        if self._use_mmsg:
+            self._bufs = [ctypes.create_string_buffer(buf_size) for _ in range(max_batch)]
+            self._addrs = (_SockAddrIn * max_batch)()
+            self._iov = (_IoVec * max_batch)()
+            self._msgs = (_MMsgHdr * max_batch)()
+            for i in range(max_batch):
+                self._iov[i].iov_base = ctypes.cast(self._bufs[i], ctypes.c_char_p)
+                self._iov[i].iov_len = buf_size
+                hdr = self._msgs[i].msg_hdr
+                hdr.msg_iov = ctypes.pointer(self._iov[i])
+                hdr.msg_iovlen = 1
+                hdr.msg_name = ctypes.addressof(self._addrs[i])
+
+    def recv(self) -> List[Tuple[bytes, Tuple[str, int]]]:
+        """
+        Return up to max_batch queued datagrams without blocking.
+        An empty list means the socket has been drained.
+        """
+        if not self._use_mmsg:
+            return self._recv_fallback()
+
+        for i in range(self.max_batch):
+            self._msgs[i].msg_hdr.msg_namelen = ctypes.sizeof(_SockAddrIn)
+        rc = _recvmmsg(self.sock.fileno(), ctypes.addressof(self._msgs),
+                       self.max_batch, MSG_DONTWAIT, None)
+        if rc < 0:
+            err = ctypes.get_errno()
+            if err in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR):
+                return []
+            raise OSError(err, os.strerror(err))
+
+        out = []
+        for i in range(rc):
+            sa = self._addrs[i]
+            addr = (socket.inet_ntoa(bytes(sa.sin_addr)), socket.ntohs(sa.sin_port))
+            out.append((ctypes.string_at(self._bufs[i], self._msgs[i].msg_len), addr))
+        return out
+
+    def _recv_fallback(self) -> List[Tuple[bytes, Tuple[str, int]]]:
+        out = []
+        for _ in range(self.max_batch):
+            try:
+                out.append(self.sock.recvfrom(self.buf_size))
+            except BlockingIOError:
+                break
+        return out